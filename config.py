@@ -1,28 +1,42 @@
 # config.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 import logging
 from pathlib import Path
-from typing import Callable
 
-import networkx as nx
+
+@lru_cache(maxsize=1)
+def _project_root() -> Path:
+    """ Resolve the project root once, so the filesystem is only queried a single time. """
+    return Path(__file__).resolve().parent
+
+
+PROJECT_ROOT = _project_root()
+
+# Directories already created (or found) in this process, so repeated calls skip the mkdir syscalls
+_ENSURED_DIRS: set = set()
 
 
 # Directory config
 @dataclass(frozen=True)
 class DirectoryConfig:
     """ Configuration for project directories and data storage. """
-    PROJECT_ROOT = Path(__file__).resolve().parent
-    RAW_DATA_DIR: Path = PROJECT_ROOT / "data" / "raw"
-    PROCESSED_DATA_DIR: Path = PROJECT_ROOT / "data" / "processed"
-    SAMPLE_DATA_DIR: Path = PROJECT_ROOT / "data" / "sample_tickers"
-    LOG_DIR: Path = PROJECT_ROOT / "logs"
-    SRC_ROOT: Path = PROJECT_ROOT / "src"
+    PROJECT_ROOT: Path = field(default_factory=_project_root)
+    RAW_DATA_DIR: Path = field(default_factory=lambda: _project_root() / "data" / "raw")
+    PROCESSED_DATA_DIR: Path = field(default_factory=lambda: _project_root() / "data" / "processed")
+    SAMPLE_DATA_DIR: Path = field(default_factory=lambda: _project_root() / "data" / "sample_tickers")
+    CACHE_DIR: Path = field(default_factory=lambda: _project_root() / "data" / "cache")
+    LOG_DIR: Path = field(default_factory=lambda: _project_root() / "logs")
+    SRC_ROOT: Path = field(default_factory=lambda: _project_root() / "src")
 
     def ensure_dirs_exist(self):
         """ Ensure all necessary directories exist, handling any errors. """
-        for path in [self.RAW_DATA_DIR, self.PROCESSED_DATA_DIR, self.SAMPLE_DATA_DIR, self.LOG_DIR]:
+        for path in [self.RAW_DATA_DIR, self.PROCESSED_DATA_DIR, self.SAMPLE_DATA_DIR, self.CACHE_DIR, self.LOG_DIR]:
+            if path in _ENSURED_DIRS:
+                continue
             try:
                 path.mkdir(parents=True, exist_ok=True)
+                _ENSURED_DIRS.add(path)
             except PermissionError:
                 print(f"Error: Permission denied while creating {path}. Check folder permissions.")
             except FileExistsError:
@@ -32,6 +46,7 @@ class DirectoryConfig:
 
 
 DIRECTORY_CONFIG = DirectoryConfig()
+DIRECTORY_CONFIG.ensure_dirs_exist()
 
 
 # Graph config
@@ -41,14 +56,41 @@ class GraphConfig:
     COLOURING_MODE: str = 'community_colouring'
     NODE_SIZE: int = 8
     EDGE_OPACITY: float = 0.6
+    # Draw edges as up to 3 traces of rising opacity by |correlation| (1 draws every edge alike)
+    EDGE_OPACITY_BUCKETS: int = 1
+    # Only draw edges with |correlation| >= this in the 3D figure (0 draws every edge of the network)
+    EDGE_WEIGHT_THRESHOLD: float = 0.0
+    # Graphs with more nodes than this show node labels on hover only, instead of as text in the scene
+    LABEL_LIMIT: int = 500
 
     # Graph layout positioning
     SEED: int = 42
     K: float = 0.3
     DIM: int = 3
-    LAYOUT_FUNC: Callable = nx.spring_layout
-    # LAYOUT_FUNC: Callable = nx.kamada_kawai_layout
-    # LAYOUT_FUNC: Callable = nx.fruchterman_reingold_layout
+    # Name of a networkx layout function, resolved in the visualization module so config stays import-light
+    LAYOUT_FUNC_NAME: str = "spring_layout"
+    # LAYOUT_FUNC_NAME: str = "kamada_kawai_layout"
+    # LAYOUT_FUNC_NAME: str = "fruchterman_reingold_layout"
+    # "igraph" for igraph's compiled Fruchterman-Reingold layout, "numpy" / "numba" / "cupy" for the
+    # vectorized, JIT-compiled or GPU spring layout, "barnes_hut" for its octree-approximated variant for
+    # large graphs (numba and cupy are optional), or "nx" for LAYOUT_FUNC_NAME above
+    LAYOUT_ENGINE: str = "igraph"
+    # Iteration cap of the numpy / numba / cupy / barnes_hut layouts, which also stop early once no node moves
+    # further than LAYOUT_TOL in an iteration
+    ITERATIONS: int = 20
+    LAYOUT_TOL: float = 1e-3
+    # Reuse computed layouts from DIRECTORY_CONFIG.CACHE_DIR, keyed by graph structure and layout parameters
+    CACHE_LAYOUTS: bool = True
+    # Size budget of the cached layouts and figures; the least recently used files are evicted beyond it
+    CACHE_MAX_BYTES: int = 256_000_000
+    # Start each computed layout from the previous one, running this fraction of the usual iterations.
+    # Off by default: warm-started positions depend on which layouts ran before, so the same graph and seed
+    # no longer reproduce the same figure. The Dash app turns it on for its threshold slider.
+    WARM_START_LAYOUTS: bool = False
+    WARM_START_ITERATION_FRACTION: float = 0.2
+
+    # Community detection: "leiden" (igraph), "louvain" or "greedy" (networkx)
+    COMMUNITY_ALGORITHM: str = "leiden"
 
 
 GRAPH_CONFIG = GraphConfig()
@@ -62,6 +104,18 @@ class DataConfig:
     END_DATE: str = "2024-01-01"
     INTERVAL: str = "1d"
     CORRELATION_THRESHOLD: float = 0.5
+    # Correlations are quantized to int8 as round(corr * scale) for the compact threshold-scan path
+    CORRELATION_INT8_SCALE: int = 127
+
+    # Raw ticker files are written as "parquet" or "csv"
+    RAW_DATA_FORMAT: str = "parquet"
+    # Also export processed returns and correlations as CSV, alongside the Parquet / .npy files
+    EXPORT_CSV: bool = False
+
+    # Download behaviour
+    MAX_DOWNLOAD_WORKERS: int = 16
+    DOWNLOAD_RETRIES: int = 3
+    RETRY_BACKOFF: float = 1.0
 
 
 DATA_CONFIG = DataConfig()
@@ -74,7 +128,10 @@ class LoggerConfig:
     LOG_TO_CONSOLE: bool = False
     LOG_TO_FILE: bool = False
     LOG_LEVEL: int = logging.INFO
-    LOG_FILE_NAME_FORMAT: str = "{name}_{timestamp}.log"
+    # One rotating log file shared by the whole process; the logger name is part of each record
+    LOG_FILE_NAME: str = "app.log"
+    LOG_MAX_BYTES: int = 10_000_000
+    LOG_BACKUP_COUNT: int = 5
 
 
 LOGGER_CONFIG = LoggerConfig()
@@ -83,6 +140,8 @@ LOGGER_CONFIG = LoggerConfig()
 @dataclass(frozen=True)
 class AppConfig:
     CORRELATION_THRESHOLD_STEP = 0.01
+    # Number of per-threshold figures kept in memory by the Dash app
+    FIGURE_CACHE_SIZE: int = 64
 
 
 APP_CONFIG = AppConfig()
@@ -3,61 +3,156 @@
 Module: data_loader.py
 
 This module provides functions to download historical stock data using yfinance
-and save the results as CSV files. It includes robust error handling, logging,
+and save the results as Parquet (default) or CSV files. It includes robust error handling, logging,
 and a command-line interface to facilitate batch downloads.
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import yfinance as yf
-from tqdm import tqdm
 
 from config import DATA_CONFIG, DIRECTORY_CONFIG
+from src.data.data_processor import find_raw_data_file, scan_raw_data_files
+from src.utils.progress import progress_bar
 from src.utils.setup_logger import setup_logger
 
 # Configure module-level logger
 logger = setup_logger(__name__)
 
+# Price columns in the order yfinance returns them for a single ticker
+PRICE_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """ Check whether a yfinance error was caused by Yahoo rate limiting (HTTP 429). """
+    message = str(error)
+    return type(error).__name__ == "YFRateLimitError" or "429" in message or "Too Many Requests" in message
+
+
+def _format_ticker_frame(df: pd.DataFrame, ticker: str, interval: str) -> Optional[pd.DataFrame]:
+    """
+    Convert a flat (single-level column) yfinance price frame to the (Price, Ticker) layout
+    returned by yf.download, so every CSV is written with the same header.
+
+    Args:
+        df (pd.DataFrame): Price data with columns such as 'Close', 'High', 'Low', 'Open', 'Volume'.
+        ticker (str): Stock ticker symbol.
+        interval (str): Data interval, used to decide whether timestamps keep their timezone.
+
+    Returns:
+        Optional[pd.DataFrame]: Formatted DataFrame, or None if it contains no price data.
+    """
+    if df.empty or not set(PRICE_COLUMNS).issubset(df.columns):
+        return None
+
+    df = df[PRICE_COLUMNS].dropna(how="all")
+    if df.empty:
+        return None
+
+    # yf.download drops the exchange timezone for daily and longer intervals
+    if df.index.tz is not None and not interval.endswith(("m", "h")):
+        df.index = df.index.tz_localize(None)
+
+    df.columns = pd.MultiIndex.from_product([PRICE_COLUMNS, [ticker]], names=["Price", "Ticker"])
+    return df
+
+
+def flatten_price_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop the ticker level from a (Price, Ticker) column header, leaving one column per price field.
+
+    Args:
+        df (pd.DataFrame): DataFrame as returned by download_ticker_data.
+
+    Returns:
+        pd.DataFrame: DataFrame with single-level price columns.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel("Ticker", axis=1)
+        df.columns.name = None
+    return df
+
 
 def download_ticker_data(
         ticker: str,
         start_date: str = DATA_CONFIG.START_DATE,
         end_date: str = DATA_CONFIG.END_DATE,
-        interval: str = DATA_CONFIG.INTERVAL
+        interval: str = DATA_CONFIG.INTERVAL,
+        retries: int = DATA_CONFIG.DOWNLOAD_RETRIES
 ) -> Optional[pd.DataFrame]:
     """
     Download historical stock data for a given ticker using yfinance.
 
+    Uses Ticker.history rather than yf.download, as the latter keeps its results in
+    module-level state and is not safe to call from several threads at once. Requests
+    rejected by Yahoo's rate limit are retried with exponential backoff.
+
     Args:
         ticker (str): Stock ticker symbol.
         start_date (str): Start date in 'YYYY-MM-DD' format.
         end_date (str): End date in 'YYYY-MM-DD' format.
         interval (str): Data interval.
+        retries (int): Number of retries after a rate-limited request.
 
     Returns:
         Optional[pd.DataFrame]: DataFrame containing historical data if successful; otherwise, None.
     """
-    try:
-        logger.info(f"Downloading {ticker}: {start_date} → {end_date} (Interval: {interval})")
-        df = yf.download(ticker, start=start_date, end=end_date, interval=interval, progress=False)
+    for attempt in range(retries + 1):
+        try:
+            logger.info(f"Downloading {ticker}: {start_date} → {end_date} (Interval: {interval})")
+            history = yf.Ticker(ticker).history(start=start_date, end=end_date, interval=interval, raise_errors=True)
+            df = _format_ticker_frame(history, ticker, interval)
 
-        if df.empty:
-            logger.warning(f"No data returned for {ticker}.")
+            if df is None:
+                logger.warning(f"No data returned for {ticker}.")
+                return None
+
+            logger.info(f"Downloaded {len(df)} rows for {ticker}.")
+            return df
+        except Exception as e:
+            if _is_rate_limited(e) and attempt < retries:
+                delay = DATA_CONFIG.RETRY_BACKOFF * 2 ** attempt
+                logger.warning(f"Rate limited while downloading {ticker}, retrying in {delay:.1f}s.")
+                time.sleep(delay)
+                continue
+
+            logger.exception(f"Failed to download {ticker}: {e}")
             return None
 
-        logger.info(f"Downloaded {len(df)} rows for {ticker}.")
-        return df
-    except Exception as e:
-        logger.exception(f"Failed to download {ticker}: {e}")
-        return None
+
+def _csv_header(df: pd.DataFrame) -> str:
+    """
+    Build the CSV header pandas would write for a DataFrame, including the extra rows used
+    for (Price, Ticker) columns:
+        Price,Close,High,Low,Open,Volume
+        Ticker,AAPL,AAPL,AAPL,AAPL,AAPL
+        Date,,,,,
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        lines = [
+            ",".join([str(name), *map(str, df.columns.get_level_values(level))])
+            for level, name in enumerate(df.columns.names)
+        ]
+        lines.append(str(df.index.name) + "," * len(df.columns))
+    else:
+        lines = [",".join([str(df.index.name), *map(str, df.columns)])]
+    return "\n".join(lines) + "\n"
 
 
 def save_data_to_csv(df: pd.DataFrame, output_dir: Path, file_name: str) -> None:
     """
     Save a DataFrame to a CSV file.
 
+    The header is written as pandas would, while the data rows are written with pyarrow's
+    multithreaded CSV writer. Daily timestamps are written as plain 'YYYY-MM-DD' dates.
+
     Args:
         df (pd.DataFrame): DataFrame to be saved.
         output_dir (Path): Directory where the CSV will be saved.
@@ -75,46 +170,202 @@ def save_data_to_csv(df: pd.DataFrame, output_dir: Path, file_name: str) -> None
         if df.index.name is None:
             df.index.name = "Date"
 
-        df.to_csv(file_path)
+        index = df.index
+        if isinstance(index, pd.DatetimeIndex) and index.tz is None and (index == index.normalize()).all():
+            index_array = pa.array(index.date, type=pa.date32())
+        else:
+            index_array = pa.array(index)
+
+        table = pa.Table.from_arrays(
+            [index_array, *(pa.array(df.iloc[:, i], from_pandas=True) for i in range(df.shape[1]))],
+            names=[str(i) for i in range(df.shape[1] + 1)],
+        )
+
+        with file_path.open("wb") as f:
+            f.write(_csv_header(df).encode())
+            pa_csv.write_csv(table, f, write_options=pa_csv.WriteOptions(include_header=False))
+        logger.info(f"Data saved to {file_path}")
+    except Exception as e:
+        logger.exception(f"Failed to save data to {file_path}: {e}")
+
+
+def save_data_to_parquet(df: pd.DataFrame, output_dir: Path, file_name: str) -> None:
+    """
+    Save a DataFrame to a zstd-compressed Parquet file.
+
+    The (Price, Ticker) column header is flattened to the price level, as the ticker
+    is already encoded in the file name. Prices are stored as float32; volume keeps its
+    original type, as daily volumes exceed the integers float32 can represent exactly.
+
+    Args:
+        df (pd.DataFrame): DataFrame to be saved.
+        output_dir (Path): Directory where the Parquet file will be saved.
+        file_name (str): Name of the Parquet file to be saved.
+
+    Returns:
+        None
+    """
+    file_path = output_dir / file_name
+    try:
+        if df.empty:
+            logger.warning(f"Skipping save: DataFrame for {file_name} is empty.")
+            return
+
+        df = flatten_price_columns(df)
+        df = df.astype({col: np.float32 for col in PRICE_COLUMNS if col in df.columns and col != "Volume"})
+        if df.index.name is None:
+            df.index.name = "Date"
+
+        df.to_parquet(file_path, engine="pyarrow", compression="zstd")
         logger.info(f"Data saved to {file_path}")
     except Exception as e:
         logger.exception(f"Failed to save data to {file_path}: {e}")
 
 
+def save_ticker_data(
+        df: pd.DataFrame,
+        ticker: str,
+        output_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR,
+        file_format: str = DATA_CONFIG.RAW_DATA_FORMAT
+) -> None:
+    """
+    Save downloaded stock data for a ticker in the configured raw data format.
+
+    Args:
+        df (pd.DataFrame): DataFrame to be saved.
+        ticker (str): Stock ticker symbol, used as the file name.
+        output_dir (Path): Directory where the file will be saved.
+        file_format (str): Either "parquet" or "csv".
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    if file_format == "parquet":
+        save_data_to_parquet(df, output_dir, f"{ticker}.parquet")
+    elif file_format == "csv":
+        save_data_to_csv(df, output_dir, f"{ticker}.csv")
+    else:
+        raise ValueError(f"Unsupported raw data format: {file_format}")
+
+
+def _download_and_save_single(
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        output_dir: Path,
+        file_format: str,
+        save: bool
+) -> Optional[pd.DataFrame]:
+    """
+    Download stock data for a single ticker and optionally save it, without checking for existing files.
+
+    Returns:
+        Optional[pd.DataFrame]: The downloaded DataFrame, or None if the download failed.
+    """
+    df = download_ticker_data(ticker, start_date, end_date, interval)
+    if df is None:
+        logger.error(f"Data for {ticker} could not be downloaded.")
+        return None
+
+    if save:
+        save_ticker_data(df, ticker, output_dir, file_format)
+    return df
+
+
 def download_and_save_ticker_data(
         ticker: str,
         start_date: str = DATA_CONFIG.START_DATE,
         end_date: str = DATA_CONFIG.END_DATE,
         interval: str = DATA_CONFIG.INTERVAL,
         output_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR,
-        overwrite: bool = False
+        overwrite: bool = False,
+        file_format: str = DATA_CONFIG.RAW_DATA_FORMAT
 ) -> bool:
     """
-    Download stock data for a single ticker and save it as a CSV file.
+    Download stock data for a single ticker and save it to the raw data directory.
 
     Args:
         ticker (str): Stock ticker symbol.
         start_date (str): Start date in 'YYYY-MM-DD' format.
         end_date (str): End date in 'YYYY-MM-DD' format.
         interval (str): Data interval.
-        output_dir (Path): Directory where the CSV file will be stored.
+        output_dir (Path): Directory where the file will be stored.
         overwrite (bool): If False, will skip download if file already exists.
+        file_format (str): Either "parquet" or "csv".
 
     Returns:
         bool: True if the data was downloaded and saved successfully; False otherwise.
     """
-    file_path = output_dir / f"{ticker}.csv"
-    if not overwrite and file_path.exists():
+    file_path = find_raw_data_file(ticker, output_dir)
+    if not overwrite and file_path is not None:
         logger.info(f"Skipping {ticker}: Data already exists at {file_path}.")
         return True
 
-    df = download_ticker_data(ticker, start_date, end_date, interval)
-    if df is None:
-        logger.error(f"Data for {ticker} could not be downloaded.")
-        return False
+    df = _download_and_save_single(ticker, start_date, end_date, interval, output_dir, file_format, save=True)
+    return df is not None
+
+
+def _download_and_save_batch(
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        output_dir: Path,
+        file_format: str,
+        save: bool
+) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+    """
+    Download several tickers in one batched yfinance request and optionally save each to a file.
+
+    Args:
+        tickers (List[str]): List of stock ticker symbols.
+        start_date (str): Start date in 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY-MM-DD' format.
+        interval (str): Data interval.
+        output_dir (Path): Directory where files will be stored.
+        file_format (str): Either "parquet" or "csv".
+        save (bool): If True, each downloaded ticker is also written to output_dir.
+
+    Returns:
+        Tuple[Dict[str, pd.DataFrame], List[str]]: Downloaded DataFrames by ticker, and the tickers
+        missing from the batch result, to be retried individually.
+    """
+    try:
+        logger.info(f"Downloading {len(tickers)} tickers: {start_date} → {end_date} (Interval: {interval})")
+        batch_df = yf.download(
+            tickers,
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            group_by="ticker",
+            threads=True,
+            progress=False
+        )
+    except Exception as e:
+        logger.exception(f"Batch download failed, falling back to per-ticker downloads: {e}")
+        return {}, tickers
+
+    frames: Dict[str, pd.DataFrame] = {}
+    missing_tickers = []
+    for ticker in progress_bar(tickers, desc="Saving stock data"):
+        df = None
+        if ticker in batch_df.columns.get_level_values(0):
+            df = _format_ticker_frame(batch_df[ticker], ticker, interval)
 
-    save_data_to_csv(df, output_dir, f"{ticker}.csv")
-    return True
+        if df is None:
+            missing_tickers.append(ticker)
+            continue
+
+        logger.info(f"Downloaded {len(df)} rows for {ticker}.")
+        if save:
+            save_ticker_data(df, ticker, output_dir, file_format)
+        frames[ticker] = df
+
+    return frames, missing_tickers
 
 
 def download_and_save_multiple_tickers(
@@ -123,27 +374,79 @@ def download_and_save_multiple_tickers(
         end_date: str = DATA_CONFIG.END_DATE,
         interval: str = DATA_CONFIG.INTERVAL,
         output_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR,
-        overwrite: bool = False
-) -> None:
+        overwrite: bool = False,
+        batch: bool = True,
+        max_workers: int = DATA_CONFIG.MAX_DOWNLOAD_WORKERS,
+        file_format: str = DATA_CONFIG.RAW_DATA_FORMAT,
+        save: bool = True
+) -> Dict[str, pd.DataFrame]:
     """
     Download and save stock data for multiple tickers.
 
+    The downloaded data is also returned in memory, so the pipeline can compute returns
+    without reading the files back. Tickers with existing files are treated as cached:
+    they are not downloaded again and are not part of the returned mapping.
+
+    By default, all tickers that still need downloading are fetched in a single batched
+    yfinance request. Tickers missing from the batch result, or every ticker when batch is
+    False, are downloaded individually on a thread pool.
+
     Args:
         tickers (List[str]): List of stock ticker symbols.
         start_date (str): Start date in 'YYYY-MM-DD' format.
         end_date (str): End date in 'YYYY-MM-DD' format.
         interval (str): Data interval.
-        output_dir (Path): Directory where CSV files will be stored.
+        output_dir (Path): Directory where files will be stored.
         overwrite (bool): If False, will skip downloading if the file already exists.
+        batch (bool): If True, fetch all tickers in one request before per-ticker downloads.
+        max_workers (int): Number of threads used for per-ticker downloads.
+        file_format (str): Either "parquet" or "csv".
+        save (bool): If True, downloaded tickers are also written to output_dir.
 
     Returns:
-        None
+        Dict[str, pd.DataFrame]: Newly downloaded DataFrames by ticker, with single-level price columns.
     """
-    failed_tickers, total_tickers = 0, len(tickers)
+    total_tickers = len(tickers)
+
+    existing = set() if overwrite else set(scan_raw_data_files(output_dir))
+    pending = [t for t in tickers if t not in existing]
+    if len(pending) < total_tickers:
+        logger.info(f"Skipping {total_tickers - len(pending)} tickers with existing data in {output_dir}.")
+
+    if not pending:
+        logger.info(f"Downloaded data for {total_tickers}/{total_tickers} tickers.")
+        return {}
+
+    frames: Dict[str, pd.DataFrame] = {}
+    retry_tickers = pending
+    if batch:
+        frames, retry_tickers = _download_and_save_batch(
+            pending, start_date, end_date, interval, output_dir, file_format, save
+        )
+
+    # Download the remaining tickers one per thread, they each spend most of their time waiting on the network
+    failed_tickers = 0
+    if retry_tickers:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _download_and_save_single,
+                    ticker, start_date, end_date, interval, output_dir, file_format, save
+                ): ticker
+                for ticker in retry_tickers
+            }
+            for future in progress_bar(as_completed(futures), total=len(futures), desc="Downloading stock data"):
+                ticker = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logger.exception(f"Unexpected error downloading {ticker}: {e}")
+                    df = None
 
-    for ticker in tqdm(tickers, desc="Downloading stock data"):
-        success = download_and_save_ticker_data(ticker, start_date, end_date, interval, output_dir, overwrite)
-        if not success:
-            failed_tickers += 1
+                if df is None:
+                    failed_tickers += 1
+                else:
+                    frames[ticker] = df
 
     logger.info(f"Downloaded data for {total_tickers - failed_tickers}/{total_tickers} tickers.")
+    return {ticker: flatten_price_columns(df) for ticker, df in frames.items()}
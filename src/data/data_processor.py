@@ -3,32 +3,64 @@
 Module: data_processor.py
 
 This module processes historical stock data by computing daily returns and
-aggregating them to form a correlation matrix. It reads raw CSV files (generated
-by data_loader.py) containing stock data with a nonstandard header.
+aggregating them to form a correlation matrix. It reads raw Parquet files, or legacy
+CSV files with a nonstandard header, generated by data_loader.py.
 """
 
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
-from config import DIRECTORY_CONFIG
+from config import DATA_CONFIG, DIRECTORY_CONFIG
+from src.utils.progress import progress_bar
 from src.utils.setup_logger import setup_logger
 
 # Configure module-level logger
 logger = setup_logger(__name__)
 
+# Supported raw data file extensions, in order of preference
+RAW_DATA_SUFFIXES = (".parquet", ".csv")
+
+# Version of the cached returns / correlation results, part of their cache key. Bump it whenever the
+# computation changes, so entries written by an older (or buggy) version are never served.
+# v2: returns cached before v2 could hold z-scored values instead of the raw daily returns.
+RESULT_CACHE_VERSION = 2
+
+# Name prefix of the cached returns / correlation files. The cache shares its directory with the processed
+# outputs, so only files with this prefix are ever treated as (stale) cache entries and deleted.
+RESULT_CACHE_PREFIX = "_cache_"
+
+# Column layout of the legacy raw CSV files. Prices fit in float32, volumes can exceed its exact integer range.
+CSV_COLUMN_TYPES = {
+    "Date": pa.timestamp("ns"),
+    "Close": pa.float32(),
+    "High": pa.float32(),
+    "Low": pa.float32(),
+    "Open": pa.float32(),
+    "Volume": pa.float64(),
+}
+
 
 def compute_daily_returns(df: pd.DataFrame) -> pd.Series:
     """
     Compute daily returns from the 'Close' column.
 
+    Returns are computed directly on the underlying float32 array (c[1:] / c[:-1] - 1) rather than
+    through Series.pct_change, and non-finite results (e.g. from missing closes) are dropped.
+
     Args:
         df (pd.DataFrame): DataFrame containing historical stock data with a 'Close' column.
 
     Returns:
-        pd.Series: Daily returns, computed as percentage changes.
+        pd.Series: Daily returns as float32, computed as percentage changes.
 
     Raises:
         ValueError: If the 'Close' column is missing.
@@ -37,45 +69,129 @@ def compute_daily_returns(df: pd.DataFrame) -> pd.Series:
         logger.error("DataFrame is missing 'Close' column. Found columns: %s", df.columns.tolist())
         raise ValueError("DataFrame must include a 'Close' column.")
 
-    returns = df["Close"].pct_change().dropna()
+    close = df["Close"].to_numpy(dtype=np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = close[1:] / close[:-1] - 1.0
+
+    valid = np.isfinite(values)
+    returns = pd.Series(values[valid], index=df.index[1:][valid], name=df["Close"].name)
     logger.debug("Computed daily returns (%d entries).", len(returns))
     return returns
 
 
+def find_raw_data_file(ticker: str, input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR) -> Optional[Path]:
+    """
+    Locate the raw data file for a ticker, preferring Parquet over CSV.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        input_dir (Path): Directory containing raw data files.
+
+    Returns:
+        Optional[Path]: Path to the raw data file, or None if no file exists.
+    """
+    for suffix in RAW_DATA_SUFFIXES:
+        file_path = input_dir / f"{ticker}{suffix}"
+        if file_path.exists():
+            return file_path
+    return None
+
+
+def scan_raw_data_files(input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR) -> Dict[str, Path]:
+    """
+    List the raw data files in a directory with a single directory read, preferring Parquet over CSV.
+
+    Use this instead of find_raw_data_file when checking many tickers, as it avoids a stat call per ticker.
+
+    Args:
+        input_dir (Path): Directory containing raw data files.
+
+    Returns:
+        Dict[str, Path]: Mapping of ticker → raw data file. Empty if the directory does not exist.
+    """
+    files: Dict[str, Path] = {}
+    try:
+        with os.scandir(input_dir) as entries:
+            for entry in entries:
+                ticker, suffix = os.path.splitext(entry.name)
+                if suffix not in RAW_DATA_SUFFIXES or not entry.is_file():
+                    continue
+
+                current = files.get(ticker)
+                if current is None or RAW_DATA_SUFFIXES.index(suffix) < RAW_DATA_SUFFIXES.index(current.suffix):
+                    files[ticker] = Path(entry.path)
+    except FileNotFoundError:
+        logger.warning("Raw data directory %s does not exist.", input_dir)
+
+    return files
+
+
+def _read_raw_csv(file_path: Path, columns: Optional[List[str]] = None) -> pa.Table:
+    """
+    Read a legacy raw CSV file into an Arrow table, parsing dates with pyarrow's ISO-8601 fast path.
+
+    Daily data has plain dates and is read as naive timestamps. Intraday data carries a UTC offset
+    (e.g. '2024-01-02 09:30:00-05:00'), which the naive type rejects, so it is re-read as UTC timestamps.
+    """
+    read_options = pa_csv.ReadOptions(skip_rows=3, column_names=list(CSV_COLUMN_TYPES))
+    include_columns = None if columns is None else ["Date", *columns]
+
+    try:
+        return pa_csv.read_csv(
+            file_path,
+            read_options=read_options,
+            convert_options=pa_csv.ConvertOptions(column_types=CSV_COLUMN_TYPES, include_columns=include_columns),
+        )
+    except pa.ArrowInvalid:
+        column_types = {**CSV_COLUMN_TYPES, "Date": pa.timestamp("ns", tz="UTC")}
+        return pa_csv.read_csv(
+            file_path,
+            read_options=read_options,
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, include_columns=include_columns),
+        )
+
+
 def load_stock_data(
     ticker: str,
-    input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR
+    input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR,
+    columns: Optional[List[str]] = None,
+    file_path: Optional[Path] = None
 ) -> Optional[pd.DataFrame]:
     """
-    Load historical stock data from a CSV file with a nonstandard header format.
+    Load historical stock data from a Parquet file, or a CSV file with a nonstandard header format.
 
-    The CSV is expected to have:
+    Parquet files already store typed columns with a "Date" index. The legacy CSV is expected to have:
       - Row 0: Column names for numeric data (e.g., 'Price,Close,High,Low,Open,Volume')
       - Row 1: Ticker info (skipped)
       - Row 2: The label for the first column ('Date')
       - Row 3 onward: Data rows
 
-    The function skips the first two rows, then assigns:
+    For CSV files the function skips the three header rows and parses the data with pyarrow's
+    multithreaded reader, using the explicit column types in CSV_COLUMN_TYPES:
         ["Date", "Close", "High", "Low", "Open", "Volume"]
-    and parses the "Date" column as a datetime index.
+    The "Date" column is parsed by pyarrow's native ISO-8601 parser and becomes the datetime index.
 
     Args:
         ticker (str): Stock ticker symbol.
-        input_dir (Path): Directory containing raw CSV files.
+        input_dir (Path): Directory containing raw data files.
+        columns (List[str], optional): Price columns to load, e.g. ["Close"]. Loads all columns if None.
+        file_path (Path, optional): Raw data file for the ticker, if already known (skips the lookup).
 
     Returns:
         Optional[pd.DataFrame]: Processed DataFrame, or None if file not found or load fails.
     """
-    file_path = input_dir / f"{ticker}.csv"
-    if not file_path.exists():
-        logger.error("CSV file for %s not found at %s", ticker, file_path)
+    if file_path is None:
+        file_path = find_raw_data_file(ticker, input_dir)
+    if file_path is None:
+        logger.error("Raw data file for %s not found in %s", ticker, input_dir)
         return None
 
     try:
-        df = pd.read_csv(file_path, header=None, skiprows=2)
-        df.columns = ["Date", "Close", "High", "Low", "Open", "Volume"]
-        df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d", errors="coerce")
-        df.set_index("Date", inplace=True)
+        if file_path.suffix == ".parquet":
+            df = pd.read_parquet(file_path, engine="pyarrow", columns=columns)
+        else:
+            table = _read_raw_csv(file_path, columns)
+            df = table.to_pandas().set_index("Date")
 
         logger.info("Loaded %d rows for %s.", len(df), ticker)
         return df
@@ -84,16 +200,16 @@ def load_stock_data(
         return None
 
 
-def aggregate_daily_returns(
-    tickers: List[str],
-    input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR
+def aggregate_daily_returns_from_frames(
+    frames: Dict[str, pd.DataFrame],
+    total_tickers: Optional[int] = None
 ) -> pd.DataFrame:
     """
-    Aggregate daily returns for multiple tickers into a single DataFrame.
+    Aggregate daily returns for DataFrames that are already in memory into a single DataFrame.
 
     Args:
-        tickers (List[str]): List of ticker symbols.
-        input_dir (Path): Directory containing raw CSV files.
+        frames (Dict[str, pd.DataFrame]): Mapping of ticker → historical data with a 'Close' column.
+        total_tickers (int, optional): Number of tickers requested, used for reporting. Defaults to len(frames).
 
     Returns:
         pd.DataFrame: DataFrame where each column represents daily returns for a ticker.
@@ -101,45 +217,241 @@ def aggregate_daily_returns(
     Raises:
         ValueError: If no valid return series are found.
     """
-    returns_dict: Dict[str, pd.Series] = {}
-    failed_tickers = 0
+    closes: Dict[str, pd.Series] = {}
 
-    for ticker in tqdm(tickers, desc="Processing raw CSV data"):
-        df = load_stock_data(ticker, input_dir)
-        if df is not None:
-            try:
-                daily_returns = compute_daily_returns(df)
-                returns_dict[ticker] = daily_returns
-                logger.debug("Added returns for %s (%d entries).", ticker, len(daily_returns))
-            except Exception as e:
-                logger.error("Skipping %s due to error: %s", ticker, e)
-                failed_tickers += 1
+    for ticker, df in frames.items():
+        if "Close" not in df.columns:
+            logger.error("Skipping %s: DataFrame is missing 'Close' column.", ticker)
+            continue
+        closes[ticker] = df["Close"].astype(np.float32, copy=False).dropna()
 
-    if not returns_dict:
+    if not closes:
         logger.error("No valid return data to aggregate.")
         raise ValueError("No valid return data found.")
 
-    returns_df = pd.DataFrame(returns_dict).dropna()
-    logger.info("Processed %d/%d tickers successfully.", len(returns_dict), len(tickers))
+    # Shared calendar of every date on which at least one ticker has a return
+    close_list = list(closes.values())
+    calendar = close_list[0].index[1:].append([c.index[1:] for c in close_list[1:]]).unique().sort_values()
+
+    # Scatter each ticker's returns straight into one preallocated float32 matrix, then keep complete rows
+    M = np.full((len(calendar), len(closes)), np.nan, dtype=np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, close in enumerate(close_list):
+            values = close.to_numpy()
+            M[calendar.get_indexer(close.index[1:]), j] = values[1:] / values[:-1] - 1.0
+
+    complete = np.isfinite(M).all(axis=1)
+    returns_df = pd.DataFrame(M[complete], index=calendar[complete], columns=list(closes))
+    logger.info("Processed %d/%d tickers successfully.", len(closes), total_tickers or len(frames))
     logger.info("Aggregated daily returns shape: %s", returns_df.shape)
     return returns_df
 
 
+def aggregate_daily_returns(
+    tickers: List[str],
+    input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR,
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
+    max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Aggregate daily returns for multiple tickers into a single DataFrame.
+
+    Tickers present in `frames` are used directly; the rest are loaded from the raw data files
+    on a thread pool, as the Parquet and CSV readers release the GIL while parsing.
+
+    Args:
+        tickers (List[str]): List of ticker symbols.
+        input_dir (Path): Directory containing raw data files.
+        frames (Dict[str, pd.DataFrame], optional): In-memory historical data by ticker, e.g. as
+            returned by download_and_save_multiple_tickers.
+        max_workers (int, optional): Number of loader threads. Defaults to min(32, 4 * CPU count).
+
+    Returns:
+        pd.DataFrame: DataFrame where each column represents daily returns for a ticker.
+
+    Raises:
+        ValueError: If no valid return series are found.
+    """
+    frames = frames or {}
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    # Resolve every ticker's file from one directory scan instead of probing each path
+    raw_files = scan_raw_data_files(input_dir)
+    to_load = []
+    for ticker in tickers:
+        if ticker in frames:
+            continue
+        if ticker not in raw_files:
+            logger.error("Raw data file for %s not found in %s", ticker, input_dir)
+            continue
+        to_load.append(ticker)
+
+    loaded: Dict[str, pd.DataFrame] = {}
+    if to_load:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda t: load_stock_data(t, input_dir, columns=["Close"], file_path=raw_files[t]), to_load
+            )
+            for ticker, df in progress_bar(zip(to_load, results), total=len(to_load), desc="Processing raw data"):
+                if df is not None:
+                    loaded[ticker] = df
+
+    ticker_frames: Dict[str, pd.DataFrame] = {}
+    for ticker in tickers:
+        df = frames[ticker] if ticker in frames else loaded.get(ticker)
+        if df is not None:
+            ticker_frames[ticker] = df
+
+    return aggregate_daily_returns_from_frames(ticker_frames, total_tickers=len(tickers))
+
+
 def compute_correlation_matrix(returns_df: pd.DataFrame) -> pd.DataFrame:
     """
     Compute the correlation matrix from aggregated daily returns.
 
+    Aggregated returns contain no missing values, so the Pearson correlation is computed as a
+    single matrix product of the centered, unit-norm returns (Z^T Z), which NumPy hands to BLAS.
+    Scaling each column by its norm folds the std and the 1 / (T - 1) factor into one in-place
+    pass over a private float32 copy of the returns, rather than extra passes over the returns and
+    the N x N result; the caller's frame is never modified.
+    Inputs with missing values fall back to DataFrame.corr(), which handles them pairwise.
+
     Args:
         returns_df (pd.DataFrame): DataFrame containing daily returns.
 
     Returns:
         pd.DataFrame: Correlation matrix of daily returns.
     """
-    corr_matrix = returns_df.corr()
+    # Always copy: for float32 returns to_numpy() would otherwise return a view of the caller's frame
+    X = returns_df.to_numpy(dtype=np.float32, copy=True)
+
+    if len(X) < 2 or np.isnan(X).any():
+        corr_matrix = returns_df.corr()
+    else:
+        X -= X.mean(axis=0)
+        norms = np.sqrt(np.einsum("ij,ij->j", X, X))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            X /= norms
+        C = X.T @ X
+
+        # Remove float32 rounding outside [-1, 1] and pin the diagonal of non-constant series to exactly 1
+        np.clip(C, -1.0, 1.0, out=C)
+        C[np.diag_indices_from(C)] = np.where(norms > 0, 1.0, np.nan)
+        corr_matrix = pd.DataFrame(C, index=returns_df.columns, columns=returns_df.columns)
+
     logger.info("Computed correlation matrix with shape %s.", corr_matrix.shape)
     return corr_matrix
 
 
+def quantize_correlation_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    Quantize correlation values in [-1, 1] to int8 as round(corr * DATA_CONFIG.CORRELATION_INT8_SCALE).
+
+    At one byte per entry the matrix is a quarter of the float32 size, which speeds up the memory-bound
+    threshold scan. Missing (NaN) correlations are stored as 0.
+
+    Args:
+        values (np.ndarray): Array of correlation values.
+
+    Returns:
+        np.ndarray: The quantized int8 array.
+    """
+    scale = DATA_CONFIG.CORRELATION_INT8_SCALE
+    q = np.rint(np.nan_to_num(values, nan=0.0) * scale)
+    return np.clip(q, -scale, scale).astype(np.int8)
+
+
+def fingerprint_raw_data(tickers: List[str], input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR) -> str:
+    """
+    Fingerprint the raw data files for a set of tickers from their names, sizes and modification times.
+
+    The files themselves are not read, so this stays cheap for large ticker universes.
+
+    Args:
+        tickers (List[str]): List of ticker symbols.
+        input_dir (Path): Directory containing raw data files.
+
+    Returns:
+        str: Hex digest identifying the current state of the raw data.
+    """
+    raw_files = scan_raw_data_files(input_dir)
+    entries = []
+    for ticker in sorted(set(tickers)):
+        file_path = raw_files.get(ticker)
+        if file_path is None:
+            entries.append((ticker, None))
+            continue
+        stat = file_path.stat()
+        entries.append((ticker, file_path.name, stat.st_mtime_ns, stat.st_size))
+
+    return hashlib.blake2b(repr(entries).encode(), digest_size=16).hexdigest()
+
+
+def compute_returns_and_correlation(
+    tickers: List[str],
+    input_dir: Path = DIRECTORY_CONFIG.RAW_DATA_DIR,
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
+    cache_dir: Path = DIRECTORY_CONFIG.PROCESSED_DATA_DIR,
+    use_cache: bool = True
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute aggregated daily returns and their correlation matrix, reusing a cached result when
+    the raw data files are unchanged since the last run.
+
+    Results are cached as Parquet files named RESULT_CACHE_PREFIX + 'returns_' / 'corr_' + a key built from
+    RESULT_CACHE_VERSION and fingerprint_raw_data, and older entries with that prefix are removed when a new
+    one is written; other files in cache_dir are never touched. In-memory frames without a matching raw data
+    file cannot be fingerprinted, so the cache is bypassed for them.
+
+    Args:
+        tickers (List[str]): List of ticker symbols.
+        input_dir (Path): Directory containing raw data files.
+        frames (Dict[str, pd.DataFrame], optional): In-memory historical data by ticker.
+        cache_dir (Path): Directory where cached results are stored.
+        use_cache (bool): If False, always recompute and do not write a cache entry.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Daily returns and the correlation matrix.
+    """
+    if use_cache and frames and not set(frames).issubset(scan_raw_data_files(input_dir)):
+        logger.info("In-memory data has no matching raw data files, skipping the correlation cache.")
+        use_cache = False
+
+    returns_path = corr_path = None
+    if use_cache:
+        key = f"v{RESULT_CACHE_VERSION}_{fingerprint_raw_data(tickers, input_dir)}"
+        returns_path = cache_dir / f"{RESULT_CACHE_PREFIX}returns_{key}.parquet"
+        corr_path = cache_dir / f"{RESULT_CACHE_PREFIX}corr_{key}.parquet"
+
+        if returns_path.exists() and corr_path.exists():
+            try:
+                returns_df = pd.read_parquet(returns_path, engine="pyarrow")
+                corr_matrix = pd.read_parquet(corr_path, engine="pyarrow")
+                logger.info("Loaded cached returns and correlation matrix (key %s).", key)
+                return returns_df, corr_matrix
+            except Exception as e:
+                logger.warning("Failed to read cached correlation matrix, recomputing: %s", e)
+
+    returns_df = aggregate_daily_returns(tickers, input_dir, frames)
+    corr_matrix = compute_correlation_matrix(returns_df)
+
+    if use_cache:
+        try:
+            stale_paths = [
+                *cache_dir.glob(f"{RESULT_CACHE_PREFIX}returns_*.parquet"),
+                *cache_dir.glob(f"{RESULT_CACHE_PREFIX}corr_*.parquet"),
+            ]
+            for stale_path in stale_paths:
+                stale_path.unlink()
+            returns_df.to_parquet(returns_path, engine="pyarrow", compression="zstd")
+            corr_matrix.to_parquet(corr_path, engine="pyarrow", compression="zstd")
+            logger.info("Cached returns and correlation matrix to %s.", cache_dir)
+        except Exception as e:
+            logger.warning("Failed to cache correlation matrix to %s: %s", cache_dir, e)
+
+    return returns_df, corr_matrix
+
+
 def save_dataframe_to_csv(
     df: pd.DataFrame,
     file_name: str,
@@ -162,3 +474,91 @@ def save_dataframe_to_csv(
         logger.info("Saved DataFrame to %s", output_file)
     except Exception as e:
         logger.exception("Error saving DataFrame to %s: %s", output_file, e)
+
+
+def save_dataframe_to_parquet(
+    df: pd.DataFrame,
+    file_name: str,
+    output_dir: Path = DIRECTORY_CONFIG.PROCESSED_DATA_DIR
+) -> None:
+    """
+    Save a DataFrame to a zstd-compressed Parquet file.
+
+    Args:
+        df (pd.DataFrame): DataFrame to be saved.
+        file_name (str): Output Parquet filename.
+        output_dir (Path): Directory where the file will be stored.
+
+    Returns:
+        None
+    """
+    output_file = output_dir / file_name
+    try:
+        df.to_parquet(output_file, engine="pyarrow", compression="zstd")
+        logger.info("Saved DataFrame to %s", output_file)
+    except Exception as e:
+        logger.exception("Error saving DataFrame to %s: %s", output_file, e)
+
+
+def save_matrix_to_npy(
+    df: pd.DataFrame,
+    file_name: str,
+    output_dir: Path = DIRECTORY_CONFIG.PROCESSED_DATA_DIR,
+    dtype: str = "float32"
+) -> None:
+    """
+    Save a square, all-numeric DataFrame (e.g. the correlation matrix) as a .npy file.
+
+    The values are written as one contiguous binary block, and the labels are stored in a
+    JSON sidecar named '<stem>.columns.json' next to it.
+
+    Args:
+        df (pd.DataFrame): Square DataFrame with matching index and column labels.
+        file_name (str): Output .npy filename.
+        output_dir (Path): Directory where the files will be stored.
+        dtype (str): "float32" (default), or "int8" to store correlations quantized by
+            quantize_correlation_matrix.
+
+    Returns:
+        None
+    """
+    output_file = output_dir / file_name
+    columns_file = output_file.with_suffix(".columns.json")
+    try:
+        if np.dtype(dtype) == np.int8:
+            values = quantize_correlation_matrix(df.to_numpy())
+        else:
+            values = df.to_numpy(dtype=dtype)
+        np.save(output_file, values)
+        columns_file.write_text(json.dumps([str(c) for c in df.columns]))
+        logger.info("Saved matrix to %s", output_file)
+    except Exception as e:
+        logger.exception("Error saving matrix to %s: %s", output_file, e)
+
+
+def load_matrix_from_npy(
+    file_name: str,
+    input_dir: Path = DIRECTORY_CONFIG.PROCESSED_DATA_DIR
+) -> pd.DataFrame:
+    """
+    Load a square matrix saved by save_matrix_to_npy.
+
+    Args:
+        file_name (str): Name of the .npy file.
+        input_dir (Path): Directory where the files are stored.
+
+    Returns:
+        pd.DataFrame: The matrix, labelled by the columns in its JSON sidecar.
+
+    Raises:
+        Exception: If either file cannot be read for any reason.
+    """
+    input_file = input_dir / file_name
+    try:
+        values = np.load(input_file)
+        columns = json.loads(input_file.with_suffix(".columns.json").read_text())
+        logger.info("Loaded matrix with shape %s from %s", values.shape, input_file)
+        return pd.DataFrame(values, index=columns, columns=columns)
+    except Exception as e:
+        logger.error("Failed to load matrix from %s: %s", input_file, e)
+        raise e
@@ -3,7 +3,7 @@
 Main pipeline to build and visualize a stock correlation network.
 
 Steps:
-  1. Load ticker list from 'tickers.csv' (if present) or use defaults.
+  1. Load ticker list from a sample tickers file (one ticker per line).
   2. Download raw data for each ticker.
   3. Compute daily returns & correlation matrix.
   4. Save processed data.
@@ -11,66 +11,97 @@ Steps:
   6. Save network, community mapping, and launch Dash app for visualization.
 """
 
-import pandas as pd
-from time import sleep
-
-from data.data_loader import download_and_save_multiple_tickers
-from data.data_processor import aggregate_daily_returns, compute_correlation_matrix, save_dataframe_to_csv
-from network.network_builder import build_correlation_network, save_network
-from src.network.community_builder import detect_communities, save_communities
-from visualization.graph_plotter import generate_3d_network_figure
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
 
 # Project config & defaults
-from config import DIRECTORY_CONFIG, DATA_CONFIG
+from config import DATA_CONFIG, DIRECTORY_CONFIG
+
+
+def load_tickers(file_path: Path) -> List[str]:
+    """
+    Load a ticker list from a plain text file with one ticker per line.
+
+    CSV files with a "Ticker" column are still supported, but need pandas to parse.
+
+    Args:
+        file_path (Path): Path to the tickers file (.txt or .csv).
+
+    Returns:
+        List[str]: Ticker symbols in file order.
+    """
+    if file_path.suffix == ".csv":
+        import pandas as pd
+        return pd.read_csv(file_path)["Ticker"].tolist()
+
+    return [line.strip() for line in file_path.read_text().splitlines() if line.strip()]
 
 
 def main():
-    """Sample pipeline, uses config args for cases like file directories and more."""
+    """
+    Sample pipeline, uses config args for cases like file directories and more.
 
-    STEP_DELAY: float = 0.1
+    Pipeline stages are imported just before they run, so the heavy dependencies
+    (pandas, yfinance, networkx, plotly) are only loaded once they are needed.
+    """
 
     # Load tickers
-    ticker_csv = DIRECTORY_CONFIG.SAMPLE_DATA_DIR / "sample_tickers_A.csv"
+    ticker_file = DIRECTORY_CONFIG.SAMPLE_DATA_DIR / "sample_tickers_A.txt"
 
-    tickers_df = pd.read_csv(ticker_csv)
-    tickers = tickers_df["Ticker"].tolist()
-    print(f"Loaded {len(tickers)} tickers from {ticker_csv}.")
+    tickers = load_tickers(ticker_file)
+    print(f"Loaded {len(tickers)} tickers from {ticker_file}.")
 
     # Download raw data
+    from src.data.data_loader import download_and_save_multiple_tickers
     print("Downloading data...")
-    sleep(STEP_DELAY)
-    download_and_save_multiple_tickers(tickers)
+    frames = download_and_save_multiple_tickers(tickers)
     print("Downloaded data saved.\n")
 
-    # Process data: daily returns & correlation matrix
+    # Process data: daily returns & correlation matrix, reusing the frames downloaded above
+    # (skipped entirely when the raw data is unchanged since the last run)
+    from src.data.data_processor import (
+        compute_returns_and_correlation, save_dataframe_to_csv, save_dataframe_to_parquet, save_matrix_to_npy
+    )
     print("Processing data...")
-    sleep(STEP_DELAY)
-    returns_df = aggregate_daily_returns(tickers)
-    corr_matrix = compute_correlation_matrix(returns_df)
-
-    # Save processed data
-    daily_returns_file_name = "daily_returns.csv"
-    corr_matrix_file_name = "correlation_matrix.csv"
-    save_dataframe_to_csv(returns_df, daily_returns_file_name)
-    save_dataframe_to_csv(corr_matrix, corr_matrix_file_name)
-    print("Processed data saved.\n")
-
-    # Build correlation network
-    threshold = DATA_CONFIG.CORRELATION_THRESHOLD
-    G = build_correlation_network(corr_matrix, threshold)
-
-    # Detect communities
-    print("Detecting communities...")
-    sleep(STEP_DELAY)
-    communities = detect_communities(G)
-    communities_file_name = "communities.json"
-    save_communities(communities, communities_file_name)
-    print("Communities saved.\n")
-
-    # Save network and launch Dash app
-    network_file_name = "network.gexf"
-    save_network(G, network_file_name)
-
+    returns_df, corr_matrix = compute_returns_and_correlation(tickers, frames=frames)
+
+    # The stages below only read the processed data and G, so file writes run on background threads
+    # while the network is built and its communities are detected
+    with ThreadPoolExecutor() as executor:
+        # Save processed data
+        saves = [
+            executor.submit(save_dataframe_to_parquet, returns_df, "daily_returns.parquet"),
+            executor.submit(save_matrix_to_npy, corr_matrix, "correlation_matrix.npy"),
+            executor.submit(save_matrix_to_npy, corr_matrix, "correlation_matrix.int8.npy", dtype="int8"),
+        ]
+        if DATA_CONFIG.EXPORT_CSV:
+            saves.append(executor.submit(save_dataframe_to_csv, returns_df, "daily_returns.csv"))
+            saves.append(executor.submit(save_dataframe_to_csv, corr_matrix, "correlation_matrix.csv"))
+
+        # Build correlation network
+        from src.network.network_builder import build_correlation_network, save_network_fast
+        threshold = DATA_CONFIG.CORRELATION_THRESHOLD
+        G = build_correlation_network(corr_matrix, threshold)
+
+        # Save network while communities are detected
+        network_file_name = "network.parquet"
+        saves.append(executor.submit(save_network_fast, G, network_file_name))
+
+        # Detect communities
+        from src.network.community_builder import detect_communities, save_communities
+        print("Detecting communities...")
+        communities = detect_communities(G)
+        communities_file_name = "communities.json"
+        save_communities(communities, communities_file_name)
+        print("Communities saved.\n")
+
+        for future in saves:
+            future.result()
+    print("Processed data and network saved.\n")
+
+    # Launch visualization
+    from src.visualization.graph_plotter import generate_3d_network_figure
     fig = generate_3d_network_figure(G, communities)
     fig.show()
 
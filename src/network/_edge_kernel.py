@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Module: _edge_kernel.py
+
+This module provides a Numba-compiled kernel that enumerates the thresholded edges of a correlation
+matrix. It scans the upper triangle in parallel and writes matching pairs straight into preallocated
+output arrays, so no n² / 2 index or weight arrays are ever materialised.
+
+It requires the optional `numba` package and is only imported by network_builder when engine="numba".
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _count_edges(M: np.ndarray, threshold: float) -> np.ndarray:
+    """ Count the upper-triangle entries of each row whose absolute value is >= threshold. """
+    n = M.shape[0]
+    counts = np.zeros(n, np.int64)
+    for i in prange(n):
+        c = 0
+        for j in range(i + 1, n):
+            if abs(M[i, j]) >= threshold:
+                c += 1
+        counts[i] = c
+    return counts
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _fill_edges(
+    M: np.ndarray,
+    threshold: float,
+    offsets: np.ndarray,
+    i_out: np.ndarray,
+    j_out: np.ndarray,
+    w_out: np.ndarray
+) -> None:
+    """ Write each row's matching entries into the output arrays, starting at that row's offset. """
+    n = M.shape[0]
+    for i in prange(n):
+        k = offsets[i]
+        for j in range(i + 1, n):
+            if abs(M[i, j]) >= threshold:
+                i_out[k] = i
+                j_out[k] = j
+                w_out[k] = M[i, j]
+                k += 1
+
+
+def enumerate_edges(M: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Enumerate the upper-triangle pairs (i < j) of a square matrix with |M[i, j]| >= threshold.
+
+    Edges are returned in row-major order, matching np.triu_indices.
+
+    Args:
+        M (np.ndarray): Square matrix of correlation values.
+        threshold (float): Minimum absolute value needed to keep a pair.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Row indices, column indices and values of the kept pairs.
+    """
+    M = np.ascontiguousarray(M)
+    counts = _count_edges(M, threshold)
+
+    offsets = np.zeros(len(counts), np.int64)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    n_edges = int(counts.sum())
+
+    i_out = np.empty(n_edges, np.int64)
+    j_out = np.empty(n_edges, np.int64)
+    w_out = np.empty(n_edges, M.dtype)
+    _fill_edges(M, threshold, offsets, i_out, j_out, w_out)
+    return i_out, j_out, w_out
@@ -6,12 +6,19 @@ This module provides functions to build and analyze a stock correlation network
 Each node in the graph represents a stock, and an edge is added between two stocks if the absolute correlation
 between them exceeds a specified threshold. Edge weights are set to the corresponding correlation value.
 
-It also provides functions to save and load the network data in GEXF format.
+It also provides functions to save and load the network data, either as a Parquet edge list (fast) or in
+GEXF format (for interoperability with tools such as Gephi).
 """
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 
 from config import DATA_CONFIG, DIRECTORY_CONFIG
@@ -20,51 +27,454 @@ from src.utils.setup_logger import setup_logger
 # Configure module-level logger
 logger = setup_logger(__name__)
 
+# Key of the CSR adjacency that build_network_from_array stores in G.__networkx_cache__
+ADJ_CSR_CACHE_KEY = "correlation_adj_csr"
 
-def build_correlation_network(
-    correlation_matrix: pd.DataFrame,
-    threshold: float = DATA_CONFIG.CORRELATION_THRESHOLD
+# Side length of the blocks used to scan large correlation matrices (512² float32 = 1 MB, within L2)
+_SCAN_TILE_SIZE = 512
+
+
+def _threshold_edges(
+    M: np.ndarray,
+    threshold: float,
+    engine: str = "numpy"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the upper-triangle pairs (i < j) of a correlation array with |M[i, j]| >= threshold.
+
+    An int8 array (see data_processor.quantize_correlation_matrix) is compared against the threshold
+    in the quantized domain, and the returned weights are dequantized back to float32.
+
+    Args:
+        M (np.ndarray): Square array of correlation values (float, or int8 quantized).
+        threshold (float): Minimum absolute correlation needed to keep a pair.
+        engine (str): "numpy" for a vectorized triangle scan, or "numba" for the parallel compiled
+            kernel in _edge_kernel (falls back to "numpy" if numba is not installed).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Row indices, column indices and correlation values.
+
+    Raises:
+        ValueError: If the engine is not supported.
+    """
+    if M.dtype != np.int8:
+        return _scan_upper_triangle(M, threshold, engine)
+
+    # Compare against the smallest quantized magnitude whose dequantized value still reaches the threshold
+    scale = DATA_CONFIG.CORRELATION_INT8_SCALE
+    ii, jj, ww = _scan_upper_triangle(M, int(np.ceil(threshold * scale)), engine)
+    return ii, jj, ww.astype(np.float32) / scale
+
+
+def _scan_upper_triangle(
+    M: np.ndarray,
+    threshold: float,
+    engine: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Scan the upper triangle of M for |M[i, j]| >= threshold with the given engine, in M's own dtype. """
+    if engine == "numba":
+        try:
+            from src.network._edge_kernel import enumerate_edges
+            return enumerate_edges(M, threshold)
+        except ImportError as e:
+            logger.warning("Numba edge kernel unavailable, falling back to numpy. Error: %s", e)
+    elif engine != "numpy":
+        raise ValueError(f"Unsupported edge engine: {engine}")
+
+    n = len(M)
+    if n <= _SCAN_TILE_SIZE:
+        # Compare the whole matrix at once and keep the strict upper triangle, avoiding n² / 2 index arrays
+        ii, jj = np.nonzero(np.triu(np.abs(M) >= threshold, k=1))
+        return ii, jj, M[ii, jj]
+
+    # Large matrices are scanned in square tiles so each comparison mask stays cache-resident,
+    # sorting each row band so edges come out in row-major order like the other engines
+    ii_parts, jj_parts, ww_parts = [], [], []
+    for i0 in range(0, n, _SCAN_TILE_SIZE):
+        band_i, band_j, band_w = [], [], []
+        for j0 in range(i0, n, _SCAN_TILE_SIZE):
+            tile = M[i0:i0 + _SCAN_TILE_SIZE, j0:j0 + _SCAN_TILE_SIZE]
+            mask = np.abs(tile) >= threshold
+            if j0 == i0:
+                mask = np.triu(mask, k=1)
+            ti, tj = np.nonzero(mask)
+            band_i.append(ti + i0)
+            band_j.append(tj + j0)
+            band_w.append(tile[ti, tj])
+        band_i, band_j, band_w = np.concatenate(band_i), np.concatenate(band_j), np.concatenate(band_w)
+        order = np.lexsort((band_j, band_i))
+        ii_parts.append(band_i[order])
+        jj_parts.append(band_j[order])
+        ww_parts.append(band_w[order])
+    return np.concatenate(ii_parts), np.concatenate(jj_parts), np.concatenate(ww_parts)
+
+
+def precompute_thresholds(
+    M: np.ndarray,
+    thresholds: Sequence[float],
+    engine: str = "numpy",
+    max_workers: Optional[int] = None
+) -> Dict[float, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Enumerate the thresholded edges of one correlation array for several thresholds in parallel.
+
+    The abs / compare work of both engines runs without holding the GIL (NumPy's vectorized loops, or the
+    nogil Numba kernel), so threads scale across cores without multiprocessing's copying of M.
+
+    Args:
+        M (np.ndarray): Square array of correlation values (float32 recommended).
+        thresholds (Sequence[float]): Thresholds to scan.
+        engine (str): Edge enumeration backend, "numpy" (default) or "numba".
+        max_workers (Optional[int]): Worker threads (default: one per threshold, up to the CPU count).
+
+    Returns:
+        Dict[float, Tuple[np.ndarray, np.ndarray, np.ndarray]]: Row indices, column indices and correlation
+            values of the kept pairs, per threshold.
+    """
+    if not thresholds:
+        return {}
+
+    M = np.ascontiguousarray(M)
+    workers = max_workers or min(len(thresholds), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda t: _threshold_edges(M, t, engine), thresholds)
+        edges = dict(zip(thresholds, results))
+
+    logger.info("Precomputed edges for %d thresholds.", len(edges))
+    return edges
+
+
+def _symmetric_csr(ii: np.ndarray, jj: np.ndarray, ww: np.ndarray, n: int):
+    """ Build a symmetric n x n CSR matrix from upper-triangle pairs by mirroring them. """
+    from scipy.sparse import coo_matrix
+
+    return coo_matrix(
+        (np.concatenate((ww, ww)), (np.concatenate((ii, jj)), np.concatenate((jj, ii)))), shape=(n, n)
+    ).tocsr()
+
+
+def build_network_from_array(
+    M: np.ndarray,
+    tickers: Sequence[str],
+    threshold: float = DATA_CONFIG.CORRELATION_THRESHOLD,
+    engine: str = "numpy"
 ) -> nx.Graph:
     """
-    Build a correlation network from a given correlation matrix.
+    Build a correlation network from a correlation array and its ticker labels.
 
     Each node represents a stock (identified by its ticker). An edge is added between two stocks
     if the absolute correlation between them is >= `threshold`. The edge weight is the correlation value.
+    Working on the bare array avoids pandas label resolution entirely.
+
+    The symmetric CSR adjacency of the same edges is stored in `G.__networkx_cache__[ADJ_CSR_CACHE_KEY]`
+    (rows / columns in node order), so consumers such as the plotter can read edges as index arrays instead
+    of iterating G.edges(). NetworkX clears that cache whenever the graph is modified through its methods;
+    code that edits edge attribute dicts directly must call `nx._clear_cache(G)` afterwards.
 
     Args:
-        correlation_matrix (pd.DataFrame): A square DataFrame of pairwise correlation values.
+        M (np.ndarray): A square array of pairwise correlation values (float32 recommended, or int8 quantized).
+        tickers (Sequence[str]): Ticker labels for the rows / columns of M.
         threshold (float): Minimum absolute correlation needed to add an edge (default 0.5).
+        engine (str): Edge enumeration backend, "numpy" (default) or "numba" for very large matrices.
 
     Returns:
         nx.Graph: Undirected graph representing the correlation network.
 
     Raises:
-        ValueError: If the provided correlation_matrix is empty.
+        ValueError: If the correlation array is empty or does not match the tickers.
     """
-    if correlation_matrix.empty:
+    if M.size == 0:
         logger.error("The correlation matrix is empty.")
         raise ValueError("Correlation matrix must not be empty.")
+    if M.shape != (len(tickers), len(tickers)):
+        logger.error("Correlation matrix of shape %s does not match %d tickers.", M.shape, len(tickers))
+        raise ValueError("Correlation matrix must be square with one row per ticker.")
 
     # Initialize graph
     G = nx.Graph()
-    tickers = correlation_matrix.columns.tolist()
 
     logger.info("Adding %d nodes to the network.", len(tickers))
     G.add_nodes_from(tickers)
 
+    # Select upper-triangle pairs above the threshold
+    ii, jj, ww = _threshold_edges(M, threshold, engine)
+
     # Add edges based on threshold
-    n_edges = 0
-    for i, ticker1 in enumerate(tickers):
-        for ticker2 in tickers[i + 1:]:
-            corr_value = correlation_matrix.loc[ticker1, ticker2]
-            if abs(corr_value) >= threshold:
-                G.add_edge(ticker1, ticker2, weight=corr_value)
-                n_edges += 1
+    tickers_arr = np.asarray(tickers, dtype=object)
+    G.add_weighted_edges_from(zip(tickers_arr[ii].tolist(), tickers_arr[jj].tolist(), ww.tolist()))
+    n_edges = len(ww)
+    G.__networkx_cache__[ADJ_CSR_CACHE_KEY] = _symmetric_csr(ii, jj, ww, len(tickers))
 
     logger.info("Added %d edges using threshold = %.2f.", n_edges, threshold)
     return G
 
 
+def build_correlation_network(
+    correlation_matrix: pd.DataFrame,
+    threshold: float = DATA_CONFIG.CORRELATION_THRESHOLD,
+    engine: str = "numpy"
+) -> nx.Graph:
+    """
+    Build a correlation network from a given correlation matrix.
+
+    Thin DataFrame wrapper around build_network_from_array, scanning the values as float32.
+
+    Args:
+        correlation_matrix (pd.DataFrame): A square DataFrame of pairwise correlation values.
+        threshold (float): Minimum absolute correlation needed to add an edge (default 0.5).
+        engine (str): Edge enumeration backend, "numpy" (default) or "numba" for very large matrices.
+
+    Returns:
+        nx.Graph: Undirected graph representing the correlation network.
+
+    Raises:
+        ValueError: If the provided correlation_matrix is empty.
+    """
+    if correlation_matrix.empty:
+        logger.error("The correlation matrix is empty.")
+        raise ValueError("Correlation matrix must not be empty.")
+
+    return build_network_from_array(
+        correlation_matrix.to_numpy(dtype=np.float32, copy=False),
+        correlation_matrix.columns.tolist(),
+        threshold,
+        engine,
+    )
+
+
+def build_igraph_network(
+    correlation_matrix: pd.DataFrame,
+    threshold: float = DATA_CONFIG.CORRELATION_THRESHOLD,
+    engine: str = "numpy"
+):
+    """
+    Build the correlation network directly as an igraph Graph, without going through NetworkX.
+
+    The thresholded index pairs are handed to igraph in a single call, which avoids both the per-edge dict
+    updates of NetworkX and the later Graph.from_networkx conversion. Vertices carry the ticker as "name"
+    and edges carry the correlation as "weight".
+
+    Args:
+        correlation_matrix (pd.DataFrame): A square DataFrame of pairwise correlation values.
+        threshold (float): Minimum absolute correlation needed to add an edge (default 0.5).
+        engine (str): Edge enumeration backend, "numpy" (default) or "numba" for very large matrices.
+
+    Returns:
+        igraph.Graph: Undirected graph representing the correlation network.
+
+    Raises:
+        ValueError: If the provided correlation_matrix is empty.
+    """
+    import igraph as ig
+
+    if correlation_matrix.empty:
+        logger.error("The correlation matrix is empty.")
+        raise ValueError("Correlation matrix must not be empty.")
+
+    tickers = correlation_matrix.columns.tolist()
+    ii, jj, ww = _threshold_edges(correlation_matrix.to_numpy(), threshold, engine)
+
+    g = ig.Graph(
+        n=len(tickers),
+        edges=np.column_stack((ii, jj)).tolist(),
+        vertex_attrs={"name": tickers},
+        edge_attrs={"weight": ww.tolist()},
+    )
+
+    logger.info("Built igraph network with %d nodes and %d edges using threshold = %.2f.",
+                len(tickers), len(ww), threshold)
+    return g
+
+
+def build_adjacency(
+    correlation_matrix: pd.DataFrame,
+    threshold: float = DATA_CONFIG.CORRELATION_THRESHOLD,
+    engine: str = "numpy"
+):
+    """
+    Build the thresholded correlation network as a symmetric scipy.sparse CSR adjacency matrix.
+
+    CSR stores the edges as flat indptr / indices / data arrays rather than NetworkX's nested dicts,
+    so neighbour lookups are array slices. Entries hold the signed correlation of each kept pair.
+
+    Args:
+        correlation_matrix (pd.DataFrame): A square DataFrame of pairwise correlation values.
+        threshold (float): Minimum absolute correlation needed to add an edge (default 0.5).
+        engine (str): Edge enumeration backend, "numpy" (default) or "numba" for very large matrices.
+
+    Returns:
+        Tuple[scipy.sparse.csr_matrix, List[str]]: The adjacency matrix and the ticker for each row / column.
+
+    Raises:
+        ValueError: If the provided correlation_matrix is empty.
+    """
+    if correlation_matrix.empty:
+        logger.error("The correlation matrix is empty.")
+        raise ValueError("Correlation matrix must not be empty.")
+
+    tickers = correlation_matrix.columns.tolist()
+    n = len(tickers)
+    ii, jj, ww = _threshold_edges(correlation_matrix.to_numpy(dtype=np.float32, copy=False), threshold, engine)
+
+    A = _symmetric_csr(ii, jj, ww, n)
+
+    logger.info("Built %d x %d adjacency with %d edges using threshold = %.2f.", n, n, len(ww), threshold)
+    return A, tickers
+
+
+def adjacency_to_igraph(A, tickers: Sequence[str]):
+    """
+    Convert a symmetric CSR adjacency from build_adjacency into an undirected igraph Graph.
+
+    Args:
+        A (scipy.sparse.csr_matrix): Symmetric adjacency matrix of signed correlations.
+        tickers (Sequence[str]): Ticker labels for the rows / columns of A.
+
+    Returns:
+        igraph.Graph: Graph with the ticker as vertex "name" and the correlation as edge "weight".
+    """
+    import igraph as ig
+    from scipy.sparse import triu
+
+    upper = triu(A, k=1).tocoo()
+    return ig.Graph(
+        n=len(tickers),
+        edges=np.column_stack((upper.row, upper.col)).tolist(),
+        vertex_attrs={"name": list(tickers)},
+        edge_attrs={"weight": upper.data.tolist()},
+    )
+
+
+@dataclass(frozen=True)
+class SortedEdgeList:
+    """
+    Every upper-triangle pair of a correlation matrix, sorted by absolute correlation.
+
+    The edges above any threshold are then a suffix of the arrays, found with one binary search.
+    """
+    tickers: List[str]
+    abs_weights: np.ndarray
+    sources: np.ndarray
+    targets: np.ndarray
+    weights: np.ndarray
+
+
+def sort_edges_by_magnitude(M: np.ndarray, tickers: Sequence[str]) -> SortedEdgeList:
+    """
+    Precompute the upper-triangle pairs of a correlation array sorted by absolute correlation.
+
+    Pairs with a missing (NaN) correlation are dropped, as they never pass a threshold.
+
+    Args:
+        M (np.ndarray): A square array of pairwise correlation values.
+        tickers (Sequence[str]): Ticker labels for the rows / columns of M.
+
+    Returns:
+        SortedEdgeList: The sorted pairs, for use with build_network_from_sorted_edges.
+
+    Raises:
+        ValueError: If the correlation array is empty.
+    """
+    if M.size == 0:
+        logger.error("The correlation matrix is empty.")
+        raise ValueError("Correlation matrix must not be empty.")
+
+    iu, ju = np.triu_indices(len(M), k=1)
+    weights = M[iu, ju]
+
+    finite = np.isfinite(weights)
+    iu, ju, weights = iu[finite], ju[finite], weights[finite]
+    abs_weights = np.abs(weights)
+    order = np.argsort(abs_weights, kind="stable")
+
+    logger.info("Sorted %d candidate edges by absolute correlation.", len(order))
+    return SortedEdgeList(
+        tickers=list(tickers),
+        abs_weights=abs_weights[order],
+        sources=iu[order],
+        targets=ju[order],
+        weights=weights[order],
+    )
+
+
+def _sorted_edge_tuples(edges: SortedEdgeList, start: int, stop: Optional[int] = None) -> Iterator[Tuple]:
+    """ Yield (u, v, weight) tuples for the sorted edges in [start, stop). """
+    tickers_arr = np.asarray(edges.tickers, dtype=object)
+    return zip(
+        tickers_arr[edges.sources[start:stop]].tolist(),
+        tickers_arr[edges.targets[start:stop]].tolist(),
+        edges.weights[start:stop].tolist(),
+    )
+
+
+def build_network_from_sorted_edges(
+    edges: SortedEdgeList,
+    threshold: float = DATA_CONFIG.CORRELATION_THRESHOLD
+) -> nx.Graph:
+    """
+    Build a correlation network from precomputed sorted edges.
+
+    Produces the same graph as build_correlation_network, but selecting the edges for a threshold is a
+    binary search and a slice (O(log E + k) for k kept edges) instead of a scan of the whole matrix.
+
+    Args:
+        edges (SortedEdgeList): Sorted pairs from sort_edges_by_magnitude.
+        threshold (float): Minimum absolute correlation needed to add an edge (default 0.5).
+
+    Returns:
+        nx.Graph: Undirected graph representing the correlation network.
+    """
+    start = np.searchsorted(edges.abs_weights, threshold, side="left")
+
+    G = nx.Graph()
+    G.add_nodes_from(edges.tickers)
+    G.add_weighted_edges_from(_sorted_edge_tuples(edges, start))
+
+    logger.info("Added %d edges using threshold = %.2f.", len(edges.weights) - start, threshold)
+    return G
+
+
+def update_network_threshold(
+    G: nx.Graph,
+    edges: SortedEdgeList,
+    old_threshold: float,
+    new_threshold: float
+) -> int:
+    """
+    Move a network built by build_network_from_sorted_edges from one threshold to another, in place.
+
+    The kept edges are a suffix of the sorted list, so only the band between the two thresholds changes:
+    raising the threshold removes it and lowering it adds it back, in O(Δ edges). When the band is larger
+    than the resulting edge set (e.g. jumping from 0.0 to 0.9), the edges are rebuilt from scratch instead.
+
+    Args:
+        G (nx.Graph): Network currently holding exactly the edges with |corr| >= old_threshold.
+        edges (SortedEdgeList): The sorted pairs G was built from.
+        old_threshold (float): Threshold G currently reflects.
+        new_threshold (float): Threshold to move G to.
+
+    Returns:
+        int: Number of edges added or removed (0 means the edge set is unchanged).
+    """
+    old_start = np.searchsorted(edges.abs_weights, old_threshold, side="left")
+    new_start = np.searchsorted(edges.abs_weights, new_threshold, side="left")
+    changed = int(abs(new_start - old_start))
+    if changed == 0:
+        return 0
+
+    if new_start > old_start and changed > len(edges.weights) - new_start:
+        G.clear_edges()
+        G.add_weighted_edges_from(_sorted_edge_tuples(edges, new_start))
+    elif new_start > old_start:
+        G.remove_edges_from((u, v) for u, v, _ in _sorted_edge_tuples(edges, old_start, new_start))
+    else:
+        G.add_weighted_edges_from(_sorted_edge_tuples(edges, new_start, old_start))
+
+    logger.info("Updated network from threshold %.2f to %.2f (%d edges changed).",
+                old_threshold, new_threshold, changed)
+    return changed
+
+
 def save_network(
     G: nx.Graph,
     file_name: str,
@@ -114,3 +524,68 @@ def load_network(
     except Exception as e:
         logger.error("Failed to load network graph from %s: %s", file_path, e)
         raise e
+
+
+def save_network_fast(
+    G: nx.Graph,
+    file_name: str,
+    output_dir: Path = DIRECTORY_CONFIG.PROCESSED_DATA_DIR
+) -> None:
+    """
+    Save the network graph as a zstd-compressed Parquet edge list (u, v, weight).
+
+    The node order, including isolated nodes, is stored in a JSON sidecar named '<stem>.nodes.json'.
+    This is much faster and smaller than GEXF's XML serialization.
+
+    Args:
+        G (nx.Graph): The network graph to save.
+        file_name (str): Name of the Parquet network file.
+        output_dir (Path): Location where the files will be saved.
+
+    Returns:
+        None
+    """
+    file_path = output_dir / file_name
+    nodes_file = file_path.with_suffix(".nodes.json")
+    try:
+        m = G.number_of_edges()
+        edges = pd.DataFrame({
+            "u": [u for u, _ in G.edges()],
+            "v": [v for _, v in G.edges()],
+            "weight": np.fromiter((w for _, _, w in G.edges(data="weight", default=1.0)), dtype=np.float64, count=m),
+        })
+        edges.to_parquet(file_path, compression="zstd", index=False)
+        nodes_file.write_text(json.dumps([str(n) for n in G.nodes()]))
+        logger.info("Saved network graph to %s.", file_path)
+    except Exception as e:
+        logger.error("Failed to save network graph to %s: %s", file_path, e)
+
+
+def load_network_fast(
+    file_name: str,
+    input_dir: Path = DIRECTORY_CONFIG.PROCESSED_DATA_DIR
+) -> nx.Graph:
+    """
+    Load a network graph saved by save_network_fast.
+
+    Args:
+        file_name (str): Name of the Parquet network file.
+        input_dir (Path): Location where the files are saved.
+
+    Returns:
+        nx.Graph: The loaded network graph.
+
+    Raises:
+        Exception: If either file cannot be read for any reason.
+    """
+    file_path = input_dir / file_name
+    try:
+        edges = pd.read_parquet(file_path)
+        G = nx.Graph()
+        G.add_nodes_from(json.loads(file_path.with_suffix(".nodes.json").read_text()))
+        G.add_weighted_edges_from(zip(edges["u"].tolist(), edges["v"].tolist(), edges["weight"].tolist()))
+        logger.info("Loaded network graph from %s.", file_path)
+        return G
+    except Exception as e:
+        logger.error("Failed to load network graph from %s: %s", file_path, e)
+        raise e
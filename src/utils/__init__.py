@@ -1,2 +1,3 @@
 # src/utils/__init__.py
 from .setup_logger import *
+from .progress import *
@@ -0,0 +1,37 @@
+# utils/progress.py
+import sys
+from typing import Iterable, Optional
+
+from tqdm import tqdm
+
+
+def progress_bar(iterable: Iterable,
+                 desc: str,
+                 total: Optional[int] = None,
+                 mininterval: float = 1.0) -> tqdm:
+    """
+    A tqdm progress bar throttled for large, fast loops across the project.
+
+    The bar redraws at most once per `mininterval` seconds or every 1% of items, and is
+    disabled entirely when stderr is not a terminal (e.g. logs redirected to a file).
+
+    Args:
+        iterable (Iterable): Items to iterate over.
+        desc (str): Label shown next to the bar.
+        total (int, optional): Number of items, if the iterable has no len() (e.g. as_completed).
+        mininterval (float): Minimum number of seconds between redraws.
+
+    Returns:
+        tqdm: Progress bar wrapping the iterable.
+    """
+    if total is None and hasattr(iterable, "__len__"):
+        total = len(iterable)
+
+    return tqdm(
+        iterable,
+        desc=desc,
+        total=total,
+        mininterval=mininterval,
+        miniters=max(1, (total or 0) // 100),
+        disable=not sys.stderr.isatty(),
+    )
@@ -1,6 +1,6 @@
 # utils/logger_setup.py
 import logging
-from datetime import datetime
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
 from config import LOGGER_CONFIG, DIRECTORY_CONFIG
@@ -14,6 +14,10 @@ def setup_logger(name: str,
     """
     A module level logger with configurable log locations and levels across the project.
 
+    Handlers are attached once, to the root logger, and module loggers propagate to them. The whole
+    process therefore shares a single RotatingFileHandler (and console handler), with the module name
+    emitted by the formatter, instead of opening a timestamped file per module.
+
     Args:
         name (str): The name for the logger from module (usually __name__).
         log_to_console (bool): If True, a console (Stream) handler is added.
@@ -25,32 +29,36 @@ def setup_logger(name: str,
         logging.Logger: Configured logger instance.
     """
     logger = logging.getLogger(name)
-
-    # Prevent adding multiple handlers
-    if logger.hasHandlers():
-        return logger
-
     logger.setLevel(log_level)
 
+    root = logging.getLogger()
     formatter = logging.Formatter(
         fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
+    # Prevent adding multiple handlers: each kind is only attached to the root logger once per process
+    has_file_handler = any(isinstance(h, RotatingFileHandler) for h in root.handlers)
+    has_console_handler = any(
+        isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler) for h in root.handlers
+    )
+
     # Add file handler if enabled
-    if log_to_file:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f"{name}_{timestamp}.log"
-        file_handler = logging.FileHandler(log_dir / log_filename)
+    if log_to_file and not has_file_handler:
+        file_handler = RotatingFileHandler(
+            log_dir / LOGGER_CONFIG.LOG_FILE_NAME,
+            maxBytes=LOGGER_CONFIG.LOG_MAX_BYTES,
+            backupCount=LOGGER_CONFIG.LOG_BACKUP_COUNT,
+        )
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        root.addHandler(file_handler)
 
     # Add console handler if enabled
-    if log_to_console:
+    if log_to_console and not has_console_handler:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        root.addHandler(console_handler)
 
     return logger
@@ -0,0 +1,416 @@
+#!/usr/bin/env python
+"""
+Module: _fr_numba.py
+
+This module provides Numba-compiled Fruchterman-Reingold iterations for the spring layouts in graph_plotter.
+Each node's repulsive and attractive forces are accumulated in registers and applied in fused, parallel
+passes, so none of the (n, n) temporaries of the NumPy implementation are allocated.
+
+Two repulsion schemes are available: fr_step sums the exact O(n²) pairwise forces, while bh_step builds an
+octree (a quadtree in 2D) each iteration and approximates distant cells by their centre of mass
+(Barnes-Hut), for O(n log n) iterations on large graphs.
+
+It requires the optional `numba` package and is only imported by graph_plotter when a numba engine is used.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# Tree cells deeper than this are leaves regardless of size, which bounds the tree for coincident points
+_MAX_TREE_DEPTH = 24
+
+# Kernels compute in float32 throughout: these constants keep literals from promoting arithmetic to float64.
+# The distance floors are NetworkX's (minimum distance 0.01), far above float32 underflow.
+_ZERO = np.float32(0.0)
+_HALF = np.float32(0.5)
+_MIN_DIST = np.float32(0.01)
+_MIN_DIST2 = np.float32(1e-4)
+_MIN_STEP_LENGTH = np.float32(0.1)
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def _exact_repulsion(pos: np.ndarray, k: float, out_disp: np.ndarray) -> None:
+    """ Write each node's repulsion from every other node, delta * k^2 / distance^2, into out_disp. """
+    n, dim = pos.shape
+    k2 = k * k
+    for i in prange(n):
+        disp = np.zeros(dim, pos.dtype)
+        for j in range(n):
+            if j == i:
+                continue
+            d2 = _ZERO
+            for c in range(dim):
+                d = pos[i, c] - pos[j, c]
+                d2 += d * d
+            scale = k2 / max(d2, _MIN_DIST2)
+            for c in range(dim):
+                disp[c] += (pos[i, c] - pos[j, c]) * scale
+        for c in range(dim):
+            out_disp[i, c] = disp[c]
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def _exact_repulsion_3d(pos: np.ndarray, k: float, out_disp: np.ndarray) -> None:
+    """ _exact_repulsion for dim == 3, with the coordinates unrolled into scalars kept in registers. """
+    n = pos.shape[0]
+    k2 = k * k
+    for i in prange(n):
+        xi, yi, zi = pos[i, 0], pos[i, 1], pos[i, 2]
+        fx = _ZERO
+        fy = _ZERO
+        fz = _ZERO
+        for j in range(n):
+            if j == i:
+                continue
+            dx = xi - pos[j, 0]
+            dy = yi - pos[j, 1]
+            dz = zi - pos[j, 2]
+            scale = k2 / max(dx * dx + dy * dy + dz * dz, _MIN_DIST2)
+            fx += dx * scale
+            fy += dy * scale
+            fz += dz * scale
+        out_disp[i, 0] = fx
+        out_disp[i, 1] = fy
+        out_disp[i, 2] = fz
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def _attract_and_move_3d(
+    pos: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    k: float,
+    t: float,
+    out_disp: np.ndarray
+) -> float:
+    """ _attract_and_move for dim == 3, with the coordinates unrolled into scalars kept in registers. """
+    n = pos.shape[0]
+    for i in prange(n):
+        xi, yi, zi = pos[i, 0], pos[i, 1], pos[i, 2]
+        fx, fy, fz = out_disp[i, 0], out_disp[i, 1], out_disp[i, 2]
+        for e in range(indptr[i], indptr[i + 1]):
+            j = indices[e]
+            dx = xi - pos[j, 0]
+            dy = yi - pos[j, 1]
+            dz = zi - pos[j, 2]
+            scale = weights[e] * max(np.sqrt(dx * dx + dy * dy + dz * dz), _MIN_DIST) / k
+            fx -= dx * scale
+            fy -= dy * scale
+            fz -= dz * scale
+
+        length = np.sqrt(fx * fx + fy * fy + fz * fz)
+        if length < _MIN_DIST:
+            length = _MIN_STEP_LENGTH
+        scale = t / length
+        out_disp[i, 0] = fx * scale
+        out_disp[i, 1] = fy * scale
+        out_disp[i, 2] = fz * scale
+
+    total = 0.0
+    for i in prange(n):
+        for c in range(3):
+            pos[i, c] += out_disp[i, c]
+            total += out_disp[i, c] * out_disp[i, c]
+    return np.sqrt(total)
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def _attract_and_move(
+    pos: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    k: float,
+    t: float,
+    out_disp: np.ndarray
+) -> float:
+    """
+    Add edge attraction to the repulsion in out_disp, limit each step to the temperature and move the nodes.
+
+    Returns:
+        float: Euclidean norm of all node steps.
+    """
+    n, dim = pos.shape
+    for i in prange(n):
+        disp = np.zeros(dim, pos.dtype)
+        for c in range(dim):
+            disp[c] = out_disp[i, c]
+
+        # Attraction along edges: -delta * w * distance / k
+        for e in range(indptr[i], indptr[i + 1]):
+            j = indices[e]
+            d2 = _ZERO
+            for c in range(dim):
+                d = pos[i, c] - pos[j, c]
+                d2 += d * d
+            scale = weights[e] * max(np.sqrt(d2), _MIN_DIST) / k
+            for c in range(dim):
+                disp[c] -= (pos[i, c] - pos[j, c]) * scale
+
+        # Limit the step to the temperature
+        length = _ZERO
+        for c in range(dim):
+            length += disp[c] * disp[c]
+        length = np.sqrt(length)
+        if length < _MIN_DIST:
+            length = _MIN_STEP_LENGTH
+        for c in range(dim):
+            out_disp[i, c] = disp[c] * t / length
+
+    # Move only once every step has been computed from the current positions
+    total = 0.0
+    for i in prange(n):
+        for c in range(dim):
+            pos[i, c] += out_disp[i, c]
+            total += out_disp[i, c] * out_disp[i, c]
+    return np.sqrt(total)
+
+
+@njit(fastmath=True, nogil=True, cache=True)
+def fr_step(
+    pos: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    k: float,
+    t: float,
+    out_disp: np.ndarray
+) -> float:
+    """
+    Run one Fruchterman-Reingold iteration in place, with exact pairwise repulsion.
+
+    Edges are given as a symmetric CSR adjacency, so each node reads only its own neighbours and the
+    parallel loop over nodes needs no atomic updates. All displacements are computed from the current
+    positions before any node moves. 3D layouts use kernels specialized for dim == 3.
+
+    Args:
+        pos (np.ndarray): (n, dim) node positions, updated in place.
+        indptr (np.ndarray): CSR row pointers of the adjacency.
+        indices (np.ndarray): CSR column indices of the adjacency.
+        weights (np.ndarray): Non-negative attraction strength of each CSR entry.
+        k (float): Optimal distance between nodes.
+        t (float): Current temperature (largest step a node may take).
+        out_disp (np.ndarray): (n, dim) scratch buffer for the step of each node.
+
+    Returns:
+        float: Euclidean norm of all node steps, for the convergence check.
+    """
+    if pos.shape[1] == 3:
+        _exact_repulsion_3d(pos, k, out_disp)
+        return _attract_and_move_3d(pos, indptr, indices, weights, k, t, out_disp)
+    _exact_repulsion(pos, k, out_disp)
+    return _attract_and_move(pos, indptr, indices, weights, k, t, out_disp)
+
+
+@njit(cache=True)
+def _grow(arr: np.ndarray, size: int) -> np.ndarray:
+    """ Return a copy of arr with its first axis enlarged to size. """
+    out = np.empty((size,) + arr.shape[1:], arr.dtype)
+    out[:arr.shape[0]] = arr
+    return out
+
+
+@njit(nogil=True, cache=True)
+def _build_tree(pos: np.ndarray, leaf_size: int):
+    """
+    Build an octree (2^dim children per cell) over the positions, breadth first.
+
+    Each cell covers a contiguous range [start, end) of `perm`, the node indices sorted by cell, and its
+    non-empty children are stored contiguously from `first_child`.
+
+    Returns:
+        Tuple: (half_width, com, mass, start, end, first_child, n_children, perm, n_cells).
+    """
+    n, dim = pos.shape
+    n_child = 1 << dim
+    cap = 4 * n + n_child
+
+    center = np.empty((cap, dim), pos.dtype)
+    half = np.empty(cap, pos.dtype)
+    com = np.zeros((cap, dim), pos.dtype)
+    mass = np.zeros(cap, pos.dtype)
+    start = np.empty(cap, np.int64)
+    end = np.empty(cap, np.int64)
+    first_child = np.full(cap, -1, np.int64)
+    n_children = np.zeros(cap, np.int64)
+    depth = np.zeros(cap, np.int64)
+
+    perm = np.arange(n)
+    tmp = np.empty(n, np.int64)
+    codes = np.empty(n, np.int64)
+
+    # Root cell: a cube around the bounding box of all positions
+    width = _ZERO
+    for c in range(dim):
+        lo = pos[0, c]
+        hi = pos[0, c]
+        for i in range(1, n):
+            lo = min(lo, pos[i, c])
+            hi = max(hi, pos[i, c])
+        center[0, c] = _HALF * (lo + hi)
+        width = max(width, hi - lo)
+    half[0] = _HALF * width + np.float32(1e-6)
+    start[0] = 0
+    end[0] = n
+    n_cells = 1
+
+    cell = 0
+    while cell < n_cells:
+        s = start[cell]
+        e = end[cell]
+        for p in range(s, e):
+            for c in range(dim):
+                com[cell, c] += pos[perm[p], c]
+        mass[cell] = e - s
+        for c in range(dim):
+            com[cell, c] /= mass[cell]
+
+        if e - s > leaf_size and depth[cell] < _MAX_TREE_DEPTH:
+            # Counting sort of the cell's nodes by child octant
+            counts = np.zeros(n_child, np.int64)
+            for p in range(s, e):
+                code = 0
+                for c in range(dim):
+                    if pos[perm[p], c] > center[cell, c]:
+                        code |= 1 << c
+                codes[p] = code
+                counts[code] += 1
+            offsets = np.empty(n_child, np.int64)
+            acc = s
+            for q in range(n_child):
+                offsets[q] = acc
+                acc += counts[q]
+            cursor = offsets.copy()
+            for p in range(s, e):
+                tmp[cursor[codes[p]]] = perm[p]
+                cursor[codes[p]] += 1
+            perm[s:e] = tmp[s:e]
+
+            if n_cells + n_child > cap:
+                cap *= 2
+                center = _grow(center, cap)
+                half = _grow(half, cap)
+                com = _grow(com, cap)
+                com[n_cells:] = _ZERO
+                mass = _grow(mass, cap)
+                start = _grow(start, cap)
+                end = _grow(end, cap)
+                first_child = _grow(first_child, cap)
+                first_child[n_cells:] = -1
+                n_children = _grow(n_children, cap)
+                n_children[n_cells:] = 0
+                depth = _grow(depth, cap)
+
+            first_child[cell] = n_cells
+            for q in range(n_child):
+                if counts[q] == 0:
+                    continue
+                child = n_cells
+                n_cells += 1
+                start[child] = offsets[q]
+                end[child] = offsets[q] + counts[q]
+                depth[child] = depth[cell] + 1
+                half[child] = _HALF * half[cell]
+                for c in range(dim):
+                    if (q >> c) & 1:
+                        center[child, c] = center[cell, c] + half[child]
+                    else:
+                        center[child, c] = center[cell, c] - half[child]
+                n_children[cell] += 1
+        cell += 1
+
+    return half, com, mass, start, end, first_child, n_children, perm, n_cells
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def _bh_repulsion(pos: np.ndarray, k: float, theta: float, leaf_size: int, out_disp: np.ndarray) -> None:
+    """
+    Write each node's Barnes-Hut approximated repulsion into out_disp.
+
+    A cell of width w at distance d from a node is treated as a single body of its total mass at its centre
+    of mass when w / d < theta; cells containing the node itself are always opened.
+    """
+    n, dim = pos.shape
+    k2 = k * k
+    n_child = 1 << dim
+    half, com, mass, start, end, first_child, n_children, perm, _ = _build_tree(pos, leaf_size)
+
+    rank = np.empty(n, np.int64)
+    for p in range(n):
+        rank[perm[p]] = p
+
+    for i in prange(n):
+        disp = np.zeros(dim, pos.dtype)
+        stack = np.empty(_MAX_TREE_DEPTH * n_child + 1, np.int64)
+        stack[0] = 0
+        top = 1
+        while top > 0:
+            top -= 1
+            cell = stack[top]
+
+            if n_children[cell] == 0:
+                # Leaf: exact forces from its nodes
+                for p in range(start[cell], end[cell]):
+                    j = perm[p]
+                    if j == i:
+                        continue
+                    d2 = _ZERO
+                    for c in range(dim):
+                        d = pos[i, c] - pos[j, c]
+                        d2 += d * d
+                    scale = k2 / max(d2, _MIN_DIST2)
+                    for c in range(dim):
+                        disp[c] += (pos[i, c] - pos[j, c]) * scale
+                continue
+
+            d2 = _ZERO
+            for c in range(dim):
+                d = pos[i, c] - com[cell, c]
+                d2 += d * d
+            width = half[cell] + half[cell]
+            contains_i = start[cell] <= rank[i] < end[cell]
+            if not contains_i and width * width < theta * theta * d2:
+                scale = mass[cell] * k2 / max(d2, _MIN_DIST2)
+                for c in range(dim):
+                    disp[c] += (pos[i, c] - com[cell, c]) * scale
+            else:
+                for child in range(first_child[cell], first_child[cell] + n_children[cell]):
+                    stack[top] = child
+                    top += 1
+
+        for c in range(dim):
+            out_disp[i, c] = disp[c]
+
+
+@njit(fastmath=True, nogil=True, cache=True)
+def bh_step(
+    pos: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    k: float,
+    t: float,
+    theta: float,
+    out_disp: np.ndarray
+) -> float:
+    """
+    Run one Fruchterman-Reingold iteration in place, with Barnes-Hut approximated repulsion.
+
+    Args:
+        pos (np.ndarray): (n, dim) node positions, updated in place.
+        indptr (np.ndarray): CSR row pointers of the adjacency.
+        indices (np.ndarray): CSR column indices of the adjacency.
+        weights (np.ndarray): Non-negative attraction strength of each CSR entry.
+        k (float): Optimal distance between nodes.
+        t (float): Current temperature (largest step a node may take).
+        theta (float): Opening angle; larger is faster and coarser (0 gives exact forces).
+        out_disp (np.ndarray): (n, dim) scratch buffer for the step of each node.
+
+    Returns:
+        float: Euclidean norm of all node steps, for the convergence check.
+    """
+    _bh_repulsion(pos, k, theta, 8, out_disp)
+    if pos.shape[1] == 3:
+        return _attract_and_move_3d(pos, indptr, indices, weights, k, t, out_disp)
+    return _attract_and_move(pos, indptr, indices, weights, k, t, out_disp)
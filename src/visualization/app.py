@@ -4,27 +4,66 @@ Module: app.py
 
 This Dash application creates an interactive dashboard for visualizing the stock correlation network.
 It utilizes the following modules:
-    - network_builder (to construct the network from a correlation matrix),
+    - network_builder (to construct the network from a correlation matrix's sorted edges, and to update it
+      incrementally as the threshold changes),
     - community_builder (to detect communities),
     - graph_plotter (to generate an interactive Plotly 3D network figure).
 """
 
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 from pathlib import Path
+from typing import List, Tuple
 
 import dash
 from dash import dcc, html, Input, Output
+import numpy as np
 import pandas as pd
 
 from config import DIRECTORY_CONFIG, APP_CONFIG, DATA_CONFIG
-from src.network.network_builder import build_correlation_network
+from src.network.network_builder import (
+    build_network_from_sorted_edges, sort_edges_by_magnitude, update_network_threshold
+)
 from src.network.community_builder import detect_communities
 from src.visualization.graph_plotter import generate_3d_network_figure
 
-# Define the path for the processed correlation matrix
+# Define the paths for the processed correlation matrix (binary, with the CSV export as a fallback)
+CORR_MATRIX_NPY_FILE = Path(DIRECTORY_CONFIG.PROCESSED_DATA_DIR) / "correlation_matrix.npy"
 CORR_MATRIX_FILE = Path(DIRECTORY_CONFIG.PROCESSED_DATA_DIR) / "correlation_matrix.csv"
 
-# Load the correlation matrix
-corr_matrix = pd.read_csv(CORR_MATRIX_FILE, index_col=0)
+
+@cache
+def _load_corr() -> Tuple[np.ndarray, List[str]]:
+    """
+    Load the correlation matrix once, on first use, as bare float32 values and ticker labels.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: The correlation values and their tickers.
+    """
+    if CORR_MATRIX_NPY_FILE.exists():
+        from src.data.data_processor import load_matrix_from_npy
+        corr_matrix = load_matrix_from_npy(CORR_MATRIX_NPY_FILE.name)
+    else:
+        columns = pd.read_csv(CORR_MATRIX_FILE, nrows=0).columns[1:]
+        corr_matrix = pd.read_csv(
+            CORR_MATRIX_FILE, index_col=0, dtype={c: np.float32 for c in columns}, engine="c"
+        )
+    return corr_matrix.to_numpy(dtype=np.float32, copy=False), corr_matrix.columns.tolist()
+
+
+@cache
+def _load_sorted_edges():
+    """
+    Sort the correlation matrix's edges once, so each threshold is answered with a slice.
+
+    Returns:
+        SortedEdgeList: The matrix's edges sorted by absolute correlation.
+    """
+    return sort_edges_by_magnitude(*_load_corr())
+
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
@@ -62,25 +101,98 @@ app.layout = html.Div(
 )
 
 
+# Network for the most recently requested threshold. Edges are monotone in the threshold, so each slider
+# move only adds or removes the band of edges between the old and new value, and communities are only
+# re-detected when the edge set actually changed.
+_network_state = {"threshold": None, "G": None, "communities": None}
+_network_lock = threading.Lock()
+
+
+@lru_cache(maxsize=APP_CONFIG.FIGURE_CACHE_SIZE)
+def _compute_network_figure(threshold_key: int):
+    """
+    Update the network, detect communities and generate the figure for a threshold, memoized per slider step.
+
+    Args:
+        threshold_key (int): The threshold expressed as a whole number of slider steps.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: The 3D network figure.
+    """
+    threshold = threshold_key * APP_CONFIG.CORRELATION_THRESHOLD_STEP
+    edges = _load_sorted_edges()
+
+    # The graph is shared across callbacks, so it is updated and plotted under the lock
+    with _network_lock:
+        G = _network_state["G"]
+        if G is None:
+            G = build_network_from_sorted_edges(edges, threshold=threshold)
+            changed = True
+        else:
+            changed = update_network_threshold(G, edges, _network_state["threshold"], threshold) > 0
+
+        if changed or _network_state["communities"] is None:
+            _network_state["communities"] = detect_communities(G)
+        _network_state.update(threshold=threshold, G=G)
+
+        # Each layout starts from the previous figure's positions, so nodes stay in place as the slider moves
+        # (the positions therefore depend on the slider history, see GRAPH_CONFIG.WARM_START_LAYOUTS)
+        return generate_3d_network_figure(G=G, communities=_network_state["communities"], warm_start=True)
+
+
+# Figures are computed on one background worker. Each callback takes a sequence number, and results for
+# any request superseded by a newer one are dropped (last write wins) - queued stale requests are skipped
+# before they start, so a burst of slider changes costs about one computation.
+_figure_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="network-figure")
+_request_seq = itertools.count(1)
+_latest_request = 0
+
+
+def _compute_latest_figure(seq: int, threshold_key: int):
+    """ Compute the figure for a request, or return None if a newer request has arrived in the meantime. """
+    if seq != _latest_request:
+        return None
+    return _compute_network_figure(threshold_key)
+
+
 @app.callback(Output("network-graph", "figure"), Input("threshold-slider", "value"))
 def update_network(threshold: float):
     """
     Update the network graph based on the selected threshold.
 
+    Figures are cached by threshold, so moving the slider back to a previous value is instant. If the
+    slider moves again before a figure is ready, the stale figure is discarded.
+
     Args:
         threshold (float): The correlation threshold value from the slider.
 
     Returns:
-        plotly.graph_objs._figure.Figure: The updated 3D network figure.
+        plotly.graph_objs._figure.Figure: The updated 3D network figure, or dash.no_update if superseded.
     """
-    G = build_correlation_network(correlation_matrix=corr_matrix, threshold=threshold)
-    communities = detect_communities(G)
-    fig = generate_3d_network_figure(G=G, communities=communities)
+    global _latest_request
+    seq = next(_request_seq)
+    _latest_request = seq
+
+    threshold_key = round(threshold / APP_CONFIG.CORRELATION_THRESHOLD_STEP)
+    fig = _figure_executor.submit(_compute_latest_figure, seq, threshold_key).result()
+    if fig is None or seq != _latest_request:
+        return dash.no_update
     return fig
 
 
-def run_native_app():
-    app.run_server(debug=False)
+def run_native_app(debug: bool = False):
+    """
+    Run the Dash server.
+
+    The correlation data is loaded up front only in the process that serves requests: with debug=True,
+    Dash's reloader parent just watches files, and only its child (WERKZEUG_RUN_MAIN="true") serves.
+
+    Args:
+        debug (bool): Run Dash in debug mode with the auto-reloader.
+    """
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        _load_sorted_edges()
+    app.run_server(debug=debug)
 
 
 if __name__ == "__main__":
@@ -6,28 +6,735 @@ This module provides functions to generate 3D visualizations using Plotly:
 specifically, it creates a 3D network visualization from a NetworkX graph.
 """
 
-from typing import Optional, Dict
+import hashlib
+import os
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Literal, Optional, Dict, Tuple
 
 import networkx as nx
-import plotly.graph_objects as go
+import numpy as np
 
-from config import GRAPH_CONFIG
+# Plotly is only imported once a figure is built, so loading the layout helpers stays cheap
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+from config import DIRECTORY_CONFIG, GRAPH_CONFIG
+from src.network.network_builder import ADJ_CSR_CACHE_KEY
 from src.utils.setup_logger import setup_logger
 
 # Configure module-level logger
 logger = setup_logger(__name__)
 
+# Values accepted for `layout_engine` (see generate_3d_network_figure)
+_LAYOUT_ENGINES = ("nx", "igraph", "numpy", "numba", "cupy", "barnes_hut")
+
+
+def _igraph_layout(G: nx.Graph, dim: int, seed: int, niter: int = 500, pos: Optional[Dict] = None) -> Dict:
+    """
+    Compute a Fruchterman-Reingold layout with igraph's C implementation.
+
+    The start positions and igraph's random number generator are both seeded with `seed`, so layouts are
+    reproducible; igraph's generator is restored to the `random` module afterwards. Edges attract in
+    proportion to |correlation|, or uniformly if the graph has no edge weights.
+
+    Args:
+        G (nx.Graph): The NetworkX graph to lay out.
+        dim (int): Dimensionality of the layout (2 or 3).
+        seed (int): Random seed for the initial positions.
+        niter (int): Number of force-simulation iterations.
+        pos (dict, optional): Initial positions for some or all nodes; the others start at random.
+
+    Returns:
+        Dict: Mapping node → coordinate array.
+    """
+    import igraph as ig
+
+    nodes = list(G.nodes())
+    if not nodes:
+        return {}
+
+    g = ig.Graph.from_networkx(G)
+    # Unweighted graphs (no "weight" attribute) are laid out unweighted; edges without a weight count as 1
+    weights = None
+    if g.ecount() and "weight" in g.es.attributes():
+        weights = [1.0 if w is None else abs(w) for w in g.es["weight"]]
+    start = np.random.default_rng(seed).uniform(-1.0, 1.0, size=(len(nodes), dim))
+    if pos:
+        for i, node in enumerate(g.vs["_nx_name"]):
+            if node in pos:
+                start[i] = pos[node]
+    start = start.tolist()
+    ig.set_random_number_generator(random.Random(seed))
+    try:
+        layout = g.layout_fruchterman_reingold(weights=weights, niter=niter, seed=start, dim=dim)
+    finally:
+        ig.set_random_number_generator(random)
+    return dict(zip(g.vs["_nx_name"], np.asarray(layout.coords)))
+
+
+def _fr_step_numpy(
+        pos: np.ndarray,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        weights: np.ndarray,
+        S,
+        k: np.float32,
+        t: float,
+        block_size: int,
+        displacement: np.ndarray,
+        xp=np
+) -> float:
+    """
+    Run one vectorized Fruchterman-Reingold iteration in place and return the norm of all node steps.
+
+    On return, `displacement` holds each node's step, as with the numba kernels. `xp` is the array module
+    holding the arrays: NumPy, or CuPy to run the same operations on the GPU.
+    """
+    n = len(pos)
+
+    # Repulsion between all pairs: sum_j c_ij (pos_i - pos_j) with c_ij = k^2 / distance^2 and distances
+    # of at least 0.01. Expanding the sum and the squared distances turns both into BLAS matrix products.
+    sq_norms = xp.einsum("ij,ij->i", pos, pos)
+    for i0 in range(0, n, block_size):
+        block = pos[i0:i0 + block_size]
+        dist2 = sq_norms[i0:i0 + block_size, None] + sq_norms[None, :] - 2 * (block @ pos.T)
+        xp.maximum(dist2, np.float32(1e-4), out=dist2)
+        coef = xp.divide(k * k, dist2, out=dist2)
+        coef[xp.arange(len(block)), xp.arange(i0, i0 + len(block))] = 0
+        displacement[i0:i0 + block_size] = block * coef.sum(axis=1)[:, None] - coef @ pos
+
+    # Attraction along edges: -delta * w * distance / k, i.e. sum_j S_ij (pos_j - pos_i)
+    edge_delta = pos[rows] - pos[cols]
+    edge_dist = xp.sqrt(xp.einsum("ij,ij->i", edge_delta, edge_delta))
+    xp.maximum(edge_dist, np.float32(0.01), out=edge_dist)
+    S.data = weights * edge_dist / k
+    displacement += S @ pos - xp.bincount(rows, weights=S.data, minlength=n)[:, None].astype(np.float32) * pos
+
+    # Move each node by at most the temperature
+    length = xp.sqrt(xp.einsum("ij,ij->i", displacement, displacement))
+    length = xp.where(length < 0.01, np.float32(0.1), length)
+    displacement *= (np.float32(t) / length)[:, None]
+    pos += displacement
+    return float(xp.linalg.norm(displacement))
+
+
+def fast_spring_layout(
+        G: nx.Graph,
+        dim: int = GRAPH_CONFIG.DIM,
+        k: Optional[float] = GRAPH_CONFIG.K,
+        seed: Optional[int] = GRAPH_CONFIG.SEED,
+        iterations: int = GRAPH_CONFIG.ITERATIONS,
+        threshold: float = 1e-4,
+        tol: float = GRAPH_CONFIG.LAYOUT_TOL,
+        block_size: int = 512,
+        engine: str = "numpy",
+        theta: float = 0.8,
+        pos: Optional[Dict] = None
+) -> Dict:
+    """
+    Fruchterman-Reingold force layout vectorized with NumPy / SciPy, as a drop-in for nx.spring_layout.
+
+    Follows NetworkX's algorithm (same cooling schedule, minimum distances and early stop), but computes
+    each iteration with array operations: the all-pairs repulsion as dense matrix products over blocks of
+    `block_size` rows (bounding the (block, n) temporaries) and the edge attraction as a sparse CSR product
+    with the positions. With engine="numba" each iteration is instead one fused, parallel compiled pass, and
+    engine="barnes_hut" additionally approximates the repulsion with an octree (O(n log n) per iteration).
+    engine="cupy" runs the NumPy iteration on the GPU, for graphs with many thousands of nodes.
+    Edges attract in proportion to |correlation|. Positions are float32 and rescaled to [-1, 1].
+
+    Args:
+        G (nx.Graph): The NetworkX graph to lay out.
+        dim (int): Dimensionality of the layout (2 or 3).
+        k (float, optional): Optimal distance between nodes (default 1 / sqrt(n) when None).
+        seed (int, optional): Random seed for the initial positions.
+        iterations (int): Maximum number of iterations.
+        threshold (float): Stop once the mean node displacement of an iteration falls below this.
+        tol (float): Stop once no node moves further than this in an iteration (0 disables the check).
+        block_size (int): Rows per repulsion block (NumPy and CuPy engines).
+        engine (str): "numpy", "numba" for the fused parallel kernel in _fr_numba, "barnes_hut" for its
+            octree-approximated variant (both fall back to "numpy" if numba is not installed), or "cupy"
+            (falls back to "numpy" if cupy is not installed).
+        theta (float): Barnes-Hut opening angle; cells with width / distance below it are approximated.
+        pos (dict, optional): Initial positions for some or all nodes (as in nx.spring_layout); the others
+            start at random.
+
+    Returns:
+        Dict: Mapping node → coordinate array.
+
+    Raises:
+        ValueError: If the engine is not supported.
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(dim, dtype=np.float32)}
+
+    # Signed weights become attraction strengths; `S` reuses the adjacency's sparsity pattern each iteration
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight="weight", dtype=np.float32, format="csr")
+    rows = np.repeat(np.arange(n), np.diff(A.indptr))
+    cols = A.indices
+    weights = np.abs(A.data)
+    S = A.copy()
+
+    init_pos = pos
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, dim), dtype=np.float32)
+    if init_pos:
+        for i, node in enumerate(nodes):
+            if node in init_pos:
+                pos[i] = init_pos[node]
+    k = np.float32(np.sqrt(1.0 / n) if k is None else k)
+
+    # Initial temperature is about 0.1 of the domain, cooled linearly so the last step is size dt
+    t = float(np.ptp(pos[:, :2], axis=0).max()) * 0.1
+    dt = t / (iterations + 1)
+
+    xp = np
+    if engine in ("numba", "barnes_hut"):
+        try:
+            from src.visualization._fr_numba import bh_step, fr_step
+        except ImportError as e:
+            logger.warning("Numba layout kernel unavailable, falling back to numpy. Error: %s", e)
+            engine = "numpy"
+    elif engine == "cupy":
+        try:
+            import cupy as xp
+            import cupyx.scipy.sparse as cp_sparse
+        except ImportError as e:
+            logger.warning("CuPy is not installed, falling back to numpy. Error: %s", e)
+            engine = "numpy"
+        else:
+            # Move the positions and the edge structure to the GPU once; only the result is copied back
+            pos, rows, cols, weights = (xp.asarray(a) for a in (pos, rows, cols, weights))
+            S = cp_sparse.csr_matrix(S)
+    elif engine != "numpy":
+        raise ValueError(f"Unsupported layout engine: {engine}")
+
+    displacement = xp.empty_like(pos)
+    for _ in range(iterations):
+        if engine == "barnes_hut":
+            step = bh_step(pos, A.indptr, A.indices, weights, k, np.float32(t), np.float32(theta), displacement)
+        elif engine == "numba":
+            step = fr_step(pos, A.indptr, A.indices, weights, k, np.float32(t), displacement)
+        else:
+            step = _fr_step_numpy(pos, rows, cols, weights, S, k, t, block_size, displacement, xp=xp)
+        t -= dt
+        if step / n < threshold:
+            break
+        if tol > 0 and float(xp.einsum("ij,ij->i", displacement, displacement).max()) < tol * tol:
+            break
+
+    if xp is not np:
+        pos = xp.asnumpy(pos)
+
+    # Match nx.spring_layout's output scale: centred on the origin, largest coordinate magnitude 1
+    pos -= pos.mean(axis=0)
+    lim = np.abs(pos).max()
+    if lim > 0:
+        pos /= lim
+    return dict(zip(nodes, pos))
+
+
+def barnes_hut_layout(
+        G: nx.Graph,
+        dim: int = GRAPH_CONFIG.DIM,
+        k: Optional[float] = GRAPH_CONFIG.K,
+        seed: Optional[int] = GRAPH_CONFIG.SEED,
+        theta: float = 0.8,
+        iterations: int = GRAPH_CONFIG.ITERATIONS,
+        pos: Optional[Dict] = None,
+        tol: float = GRAPH_CONFIG.LAYOUT_TOL
+) -> Dict:
+    """
+    Fruchterman-Reingold layout with Barnes-Hut approximated repulsion, for large graphs.
+
+    Each iteration builds an octree over the current positions and treats any cell whose width / distance
+    is below `theta` as one body at its centre of mass, so repulsion costs O(n log n) instead of O(n²).
+    Accepts the same keyword arguments as nx.spring_layout's `dim`, `k` and `seed`, so it can also be
+    passed as `layout_func`. Requires numba; falls back to the exact NumPy layout without it.
+
+    Args:
+        G (nx.Graph): The NetworkX graph to lay out.
+        dim (int): Dimensionality of the layout (2 or 3).
+        k (float, optional): Optimal distance between nodes (default 1 / sqrt(n) when None).
+        seed (int, optional): Random seed for the initial positions.
+        theta (float): Opening angle; larger is faster and coarser (0 gives exact forces).
+        iterations (int): Maximum number of iterations.
+        pos (dict, optional): Initial positions for some or all nodes; the others start at random.
+        tol (float): Stop once no node moves further than this in an iteration (0 disables the check).
+
+    Returns:
+        Dict: Mapping node → coordinate array.
+    """
+    return fast_spring_layout(
+        G, dim=dim, k=k, seed=seed, iterations=iterations, tol=tol, engine="barnes_hut", theta=theta, pos=pos
+    )
+
+
+def _positions_array(pos: Dict, nodes: list, dim: int) -> np.ndarray:
+    """ Convert a mapping node → position into a contiguous float32 (n, dim) array in `nodes` order. """
+    # fromiter fills one preallocated (n, dim) buffer, without an intermediate list of n per-node arrays
+    return np.fromiter((pos[node] for node in nodes), dtype=np.dtype((np.float32, dim)), count=len(nodes))
+
+
+def _layout_cache_key(nodes: list, edges: np.ndarray, weights: np.ndarray, params: tuple) -> str:
+    """
+    Hash a graph's node order, weighted edge set and the layout parameters into a cache key.
+
+    Edges are sorted first, so graphs with the same edges added in a different order share a key.
+
+    Args:
+        nodes (list): The graph's nodes, in order.
+        edges (np.ndarray): (m, 2) endpoint indices into `nodes`.
+        weights (np.ndarray): Weight of each edge.
+        params (tuple): Layout parameters that affect the result.
+
+    Returns:
+        str: Hex digest identifying the layout.
+    """
+    ij = np.sort(edges, axis=1)
+    order = np.lexsort((ij[:, 1], ij[:, 0]))
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((nodes, params)).encode())
+    h.update(ij[order].tobytes())
+    h.update(weights.astype(np.float32)[order].tobytes())
+    return h.hexdigest()
+
+
+# Files in the cache directory subject to prune_cache; the warm-start file 'last_pos.npz' is always kept
+_CACHE_FILE_PATTERNS = ("layout_*.npz", "figure_*.html")
+
+
+def prune_cache(
+        cache_dir: Path = DIRECTORY_CONFIG.CACHE_DIR,
+        max_bytes: int = GRAPH_CONFIG.CACHE_MAX_BYTES
+) -> int:
+    """
+    Evict the least recently used cached layouts and figures until their total size is within max_bytes.
+
+    Files are ranked by modification time, which cache hits refresh, so frequently reused layouts survive.
+    prune_cache(max_bytes=0) clears the cache.
+
+    Args:
+        cache_dir (Path): Directory holding the cached layouts and figures.
+        max_bytes (int): Size budget for all cached files together.
+
+    Returns:
+        int: Number of files removed.
+    """
+    entries = []
+    for pattern in _CACHE_FILE_PATTERNS:
+        for path in cache_dir.glob(pattern):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    # Keep the newest files that fit the budget, remove everything older
+    entries.sort(key=lambda entry: entry[0], reverse=True)
+    total = removed = 0
+    for _, size, path in entries:
+        total += size
+        if total > max_bytes:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+    if removed:
+        logger.info("Evicted %d cached files from %s.", removed, cache_dir)
+    return removed
+
+
+def _cached_layout(
+        nodes: list,
+        edges: np.ndarray,
+        weights: np.ndarray,
+        params: tuple,
+        compute: Callable[[], Dict],
+        dim: int,
+        cache_dir: Path = DIRECTORY_CONFIG.CACHE_DIR
+) -> np.ndarray:
+    """
+    Return node positions from the on-disk layout cache, computing and storing them on a miss.
+
+    Layouts are stored as compressed 'layout_<key>.npz' files holding the node labels and a float32
+    (n, dim) coordinate array. A hit refreshes the file's modification time, and each write evicts the least
+    recently used files beyond GRAPH_CONFIG.CACHE_MAX_BYTES (see prune_cache).
+
+    Args:
+        nodes (list): The graph's nodes, in order.
+        edges (np.ndarray): (m, 2) endpoint indices into `nodes`.
+        weights (np.ndarray): Weight of each edge.
+        params (tuple): Layout parameters that affect the result (part of the cache key).
+        compute (Callable[[], Dict]): Computes the mapping node → position on a cache miss.
+        dim (int): Dimensionality of the layout.
+        cache_dir (Path): Directory holding the cached layouts.
+
+    Returns:
+        np.ndarray: float32 (n, dim) positions in `nodes` order.
+    """
+    if not nodes:
+        return np.empty((0, dim), dtype=np.float32)
+    cache_file = cache_dir / f"layout_{_layout_cache_key(nodes, edges, weights, params)}.npz"
+    labels = [str(node) for node in nodes]
+
+    coords = None
+    if cache_file.exists():
+        try:
+            with np.load(cache_file, allow_pickle=False) as cached:
+                if cached["nodes"].tolist() == labels:
+                    coords = np.ascontiguousarray(cached["coords"], dtype=np.float32)
+            if coords is not None:
+                os.utime(cache_file)
+                logger.info("Loaded cached layout from %s.", cache_file)
+                return coords
+        except Exception as e:
+            logger.warning("Failed to read cached layout %s, recomputing: %s", cache_file, e)
+
+    coords = _positions_array(compute(), nodes, dim)
+    try:
+        np.savez_compressed(cache_file, nodes=np.array(labels), coords=coords)
+        logger.info("Cached layout to %s.", cache_file)
+        prune_cache(cache_dir)
+    except Exception as e:
+        logger.warning("Failed to cache layout to %s: %s", cache_file, e)
+    return coords
+
+
+def _warm_start_positions(
+        G: nx.Graph,
+        nodes: list,
+        dim: int,
+        seed: int,
+        cache_dir: Path = DIRECTORY_CONFIG.CACHE_DIR
+) -> Optional[Dict]:
+    """
+    Build initial positions for `nodes` from the last layout saved by _save_warm_start.
+
+    Nodes missing from the previous layout start at the centroid of their already placed neighbours, or at
+    random if they have none. The previous layout is only used if it places at least half of the nodes.
+
+    Args:
+        G (nx.Graph): The graph about to be laid out.
+        nodes (list): The graph's nodes, in order.
+        dim (int): Dimensionality of the layout.
+        seed (int): Random seed for nodes without placed neighbours.
+        cache_dir (Path): Directory holding 'last_pos.npz'.
+
+    Returns:
+        Dict, optional: Mapping node → initial position, or None if there is no usable previous layout.
+    """
+    warm_file = cache_dir / "last_pos.npz"
+    if not nodes or not warm_file.exists():
+        return None
+    try:
+        with np.load(warm_file, allow_pickle=False) as saved:
+            prev = dict(zip(saved["nodes"].tolist(), saved["coords"]))
+    except Exception as e:
+        logger.warning("Failed to read previous layout %s: %s", warm_file, e)
+        return None
+
+    labels = [str(node) for node in nodes]
+    known = np.fromiter((label in prev for label in labels), dtype=bool, count=len(nodes))
+    if known.mean() < 0.5 or next(iter(prev.values())).shape != (dim,):
+        return None
+
+    init = {node: prev[label] for node, label, has in zip(nodes, labels, known) if has}
+    rng = np.random.default_rng(seed)
+    for node in (node for node, has in zip(nodes, known) if not has):
+        placed = [init[nbr] for nbr in G.neighbors(node) if nbr in init]
+        init[node] = np.mean(placed, axis=0) if placed else rng.uniform(-1.0, 1.0, dim).astype(np.float32)
+    logger.info("Warm-starting layout from %s (%d of %d nodes placed).", warm_file, known.sum(), len(nodes))
+    return init
+
+
+def _save_warm_start(nodes: list, coords: np.ndarray, cache_dir: Path = DIRECTORY_CONFIG.CACHE_DIR) -> None:
+    """ Save a layout as 'last_pos.npz' in cache_dir, the warm start for the next layout computation. """
+    warm_file = cache_dir / "last_pos.npz"
+    try:
+        np.savez(warm_file, nodes=np.array([str(node) for node in nodes]), coords=coords)
+    except Exception as e:
+        logger.warning("Failed to save layout to %s: %s", warm_file, e)
+
+
+def figure_cache_path(*source_files: Path, cache_dir: Path = DIRECTORY_CONFIG.CACHE_DIR) -> Path:
+    """
+    Return the HTML cache path for a figure built from the given files with the current GRAPH_CONFIG.
+
+    The key covers each file's path, size and modification time, so rewriting the network or communities
+    file (or changing the graph config) selects a new cache file. Missing files are hashed as absent.
+
+    Args:
+        *source_files (Path): Files the figure is built from (e.g. the network and communities files).
+        cache_dir (Path): Directory holding the cached figures.
+
+    Returns:
+        Path: 'figure_<key>.html' in cache_dir (it may not exist yet).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(GRAPH_CONFIG).encode())
+    for path in source_files:
+        path = Path(path).resolve()
+        stat = path.stat() if path.exists() else None
+        h.update(repr((str(path), stat and stat.st_size, stat and stat.st_mtime_ns)).encode())
+    return cache_dir / f"figure_{h.hexdigest()}.html"
+
+
+@lru_cache(maxsize=1)
+def _community_palette() -> np.ndarray:
+    """ Return Plotly's qualitative palette as a read-only object array, importing it on first use. """
+    from plotly.colors import qualitative
+    palette = np.asarray(qualitative.Plotly, dtype=object)
+    palette.flags.writeable = False
+    return palette
+
+
+def _edge_arrays(G: nx.Graph, node_index: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the graph's edges as an (m, 2) array of node indices, with the weight of each edge.
+
+    Graphs from network_builder carry their CSR adjacency in `G.__networkx_cache__`; its upper triangle gives
+    the indices directly without iterating G.edges(). NetworkX clears that cache on every modification, so a
+    CSR that is still present matches the graph's current edges and weights.
+
+    Args:
+        G (nx.Graph): The graph whose edges to index.
+        node_index (Dict): Mapping node → position in G.nodes().
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Endpoint indices (one row per edge) and edge weights (1.0 if unset).
+    """
+    A = getattr(G, "__networkx_cache__", {}).get(ADJ_CSR_CACHE_KEY)
+    if A is not None:
+        coo = A.tocoo()
+        upper = coo.row < coo.col
+        edges = np.column_stack((coo.row[upper], coo.col[upper])).astype(np.int64, copy=False)
+        return edges, coo.data[upper]
+
+    # One pass over G.edges() resolves both endpoints and the weight of each edge into a record array
+    m = G.number_of_edges()
+    records = np.fromiter(
+        ((node_index[u], node_index[v], w) for u, v, w in G.edges(data="weight", default=1.0)),
+        dtype=[("u", np.int64), ("v", np.int64), ("weight", np.float32)],
+        count=m
+    )
+    edges = np.column_stack((records["u"], records["v"])) if m else np.empty((0, 2), dtype=np.int64)
+    return edges, records["weight"]
+
+
+def _compute_layout(
+        G: nx.Graph,
+        layout_func: Callable,
+        layout_engine: str,
+        dim: int,
+        k: float,
+        seed: int,
+        init_pos: Optional[Dict] = None
+) -> Dict:
+    """
+    Compute node positions with the requested layout engine, falling back to spring_layout on errors.
+
+    The numpy / numba / cupy / barnes_hut engines run up to GRAPH_CONFIG.ITERATIONS iterations. With `init_pos`,
+    they and the igraph engine start from those positions and run GRAPH_CONFIG.WARM_START_ITERATION_FRACTION
+    of their usual iterations; `layout_func` ignores it.
+    """
+    fraction = GRAPH_CONFIG.WARM_START_ITERATION_FRACTION if init_pos else 1.0
+    iterations = max(1, round(GRAPH_CONFIG.ITERATIONS * fraction))
+    pos = None
+    if layout_engine == "igraph":
+        try:
+            pos = _igraph_layout(G, dim=dim, seed=seed, niter=max(1, round(500 * fraction)), pos=init_pos)
+        except ImportError as e:
+            logger.warning("igraph is not installed. Falling back to the NumPy layout. Error: %s", e)
+            layout_engine = "numpy"
+    if layout_engine in ("numpy", "numba", "cupy"):
+        pos = fast_spring_layout(
+            G, dim=dim, k=k, seed=seed, iterations=iterations, tol=GRAPH_CONFIG.LAYOUT_TOL, engine=layout_engine,
+            pos=init_pos
+        )
+    elif layout_engine == "barnes_hut":
+        pos = barnes_hut_layout(
+            G, dim=dim, k=k, seed=seed, iterations=iterations, tol=GRAPH_CONFIG.LAYOUT_TOL, pos=init_pos
+        )
+    try:
+        if pos is None:
+            pos = layout_func(G, dim=dim, seed=seed, k=k)
+    except (AttributeError, TypeError) as e:
+        logger.warning("Invalid layout function or parameters. Falling back to spring_layout. Error: %s", e)
+        pos = nx.spring_layout(G, dim=dim, seed=seed, k=k)
+    return pos
+
+
+def _layout_array(
+        G: nx.Graph,
+        nodes: list,
+        edges: np.ndarray,
+        weights: np.ndarray,
+        layout_func: Callable,
+        layout_engine: str,
+        dim: int,
+        k: float,
+        seed: int,
+        cache_layout: bool,
+        warm_start: bool
+) -> np.ndarray:
+    """
+    Compute (or load from the layout cache) float32 (n, dim) positions in `nodes` order.
+
+    With `warm_start`, the layout starts from the last one (see _warm_start_positions), and every result is
+    saved as the warm start for the next call. Warm-started positions depend on that history rather than on
+    the graph and settings alone, so they bypass the layout cache.
+
+    Raises:
+        ValueError: If the layout engine is not supported.
+    """
+    if layout_engine not in _LAYOUT_ENGINES:
+        raise ValueError(f"Unsupported layout engine: {layout_engine!r} (expected one of {_LAYOUT_ENGINES})")
+
+    def compute() -> Dict:
+        init_pos = _warm_start_positions(G, nodes, dim, seed) if warm_start else None
+        return _compute_layout(G, layout_func, layout_engine, dim, k, seed, init_pos=init_pos)
+
+    if cache_layout and not warm_start:
+        layout_name = getattr(layout_func, "__name__", repr(layout_func))
+        # Every setting that changes the computed positions is part of the cache key
+        params = (layout_engine, layout_name, dim, k, seed, GRAPH_CONFIG.ITERATIONS, GRAPH_CONFIG.LAYOUT_TOL)
+        P = _cached_layout(nodes, edges, weights, params, compute, dim)
+    else:
+        P = _positions_array(compute(), nodes, dim)
+    if warm_start and len(nodes):
+        _save_warm_start(nodes, P)
+    return P
+
+
+def compute_layout(
+        G: nx.Graph,
+        layout_func: Callable = getattr(nx, GRAPH_CONFIG.LAYOUT_FUNC_NAME),
+        dim: int = GRAPH_CONFIG.DIM,
+        k: float = GRAPH_CONFIG.K,
+        seed: int = GRAPH_CONFIG.SEED,
+        layout_engine: Literal["nx", "igraph", "numpy", "numba", "cupy", "barnes_hut"] = GRAPH_CONFIG.LAYOUT_ENGINE,
+        cache_layout: bool = GRAPH_CONFIG.CACHE_LAYOUTS,
+        warm_start: bool = GRAPH_CONFIG.WARM_START_LAYOUTS
+) -> Dict:
+    """
+    Compute the node positions generate_3d_network_figure would use, for passing as `precomputed_pos`.
+
+    All arguments are picklable, so the layout can run in a worker process (e.g. through a
+    ProcessPoolExecutor) while the caller loads communities or other data.
+
+    Args:
+        G (nx.Graph): The NetworkX graph to lay out.
+        layout_func (Callable): Layout function used when layout_engine is "nx".
+        dim (int): Dimensionality of the layout.
+        k (float): Optimal distance between nodes in the layout algorithm.
+        seed (int): Random seed for layout consistency.
+        layout_engine (str): Layout engine, as for generate_3d_network_figure.
+        cache_layout (bool): Reuse (and store) layouts in the on-disk layout cache.
+        warm_start (bool): Start the layout from the previously computed one. The result then depends on
+            that history, and is not cached.
+
+    Returns:
+        Dict: Mapping node → float32 coordinate array.
+
+    Raises:
+        ValueError: If the layout engine is not supported.
+    """
+    nodes = list(G.nodes())
+    edges, weights = _edge_arrays(G, {node: i for i, node in enumerate(nodes)})
+    P = _layout_array(G, nodes, edges, weights, layout_func, layout_engine, dim, k, seed, cache_layout, warm_start)
+    return dict(zip(nodes, P))
+
+
+def _build_trace_arrays(
+        P: np.ndarray,
+        nodes: list,
+        edges: np.ndarray,
+        weights: np.ndarray,
+        communities: Optional[Dict],
+        edge_weight_threshold: float,
+        edge_opacity_buckets: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the node colours and edge coordinates of the figure's traces from the index arrays.
+
+    Args:
+        P (np.ndarray): float32 (n, dim) node positions in `nodes` order.
+        nodes (list): The graph's nodes, in order.
+        edges (np.ndarray): (m, 2) endpoint indices into `nodes`.
+        weights (np.ndarray): Weight of each edge.
+        communities (dict, optional): Mapping of node → community index.
+        edge_weight_threshold (float): Only keep edges with |weight| >= this (0 keeps all edges).
+        edge_opacity_buckets (int): Number of |weight| buckets (at most 3) to group the edges into.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Node colours (object array), float32 (dim, 3 * m') edge
+            coordinates as (x0, x1, NaN) triples per axis and the edge offsets of each bucket (length
+            buckets + 1), with edges sorted by bucket.
+    """
+    # Colour nodes by community: np.unique maps the (non-negative integer) community ids to contiguous ranks,
+    # each rank gets a palette colour and one gather colours all nodes. Nodes without a community (id -1)
+    # keep the fallback colour.
+    node_colors = np.full(len(nodes), "blue", dtype=object)
+    if communities:
+        palette = _community_palette()
+        community_ids = np.fromiter((communities.get(node, -1) for node in nodes), dtype=np.int64, count=len(nodes))
+        has_community = community_ids >= 0
+        unique_ids, ranks = np.unique(community_ids[has_community], return_inverse=True)
+        node_colors[has_community] = palette[np.arange(len(unique_ids)) % len(palette)][ranks]
+
+    # Gather both endpoints of every edge at once, as (x0, x1, NaN) triples per axis, since Plotly breaks
+    # the line at each NaN
+    abs_weights = np.abs(weights)
+    if edge_weight_threshold > 0:
+        keep = abs_weights >= edge_weight_threshold
+        edges, abs_weights = edges[keep], abs_weights[keep]
+
+    # Opacity buckets: equal-width |weight| bins, stronger edges more opaque. Edges are grouped by bucket so
+    # each bucket's trace is one contiguous slice of the coordinate buffer below.
+    n_buckets = max(1, min(int(edge_opacity_buckets), 3)) if len(edges) else 1
+    if n_buckets > 1:
+        bins = np.linspace(abs_weights.min(), abs_weights.max(), n_buckets + 1)[1:-1]
+        bucket = np.digitize(abs_weights, bins)
+        order = np.argsort(bucket, kind="stable")
+        edges = edges[order]
+        bucket_bounds = np.concatenate(([0], np.cumsum(np.bincount(bucket, minlength=n_buckets))))
+    else:
+        bucket_bounds = np.array([0, len(edges)])
+
+    # One preallocated row per axis: only the NaN separators are filled, and each axis is a contiguous block
+    edge_xyz = np.empty((P.shape[1], 3 * len(edges)), dtype=np.float32)
+    edge_xyz[:, 0::3] = P[edges[:, 0]].T
+    edge_xyz[:, 1::3] = P[edges[:, 1]].T
+    edge_xyz[:, 2::3] = np.nan
+
+    return node_colors, edge_xyz, bucket_bounds
+
 
 def generate_3d_network_figure(
         G: nx.Graph,
         communities: Optional[Dict] = None,
-        layout_func=GRAPH_CONFIG.LAYOUT_FUNC,
+        layout_func: Callable = getattr(nx, GRAPH_CONFIG.LAYOUT_FUNC_NAME),
         dim: int = GRAPH_CONFIG.DIM,
         k: float = GRAPH_CONFIG.K,
         seed: int = GRAPH_CONFIG.SEED,
         node_size: int = GRAPH_CONFIG.NODE_SIZE,
-        edge_opacity: float = GRAPH_CONFIG.EDGE_OPACITY
-) -> go.Figure:
+        edge_opacity: float = GRAPH_CONFIG.EDGE_OPACITY,
+        layout_engine: Literal["nx", "igraph", "numpy", "numba", "cupy", "barnes_hut"] = GRAPH_CONFIG.LAYOUT_ENGINE,
+        cache_layout: bool = GRAPH_CONFIG.CACHE_LAYOUTS,
+        warm_start: bool = GRAPH_CONFIG.WARM_START_LAYOUTS,
+        edge_weight_threshold: float = GRAPH_CONFIG.EDGE_WEIGHT_THRESHOLD,
+        edge_opacity_buckets: int = GRAPH_CONFIG.EDGE_OPACITY_BUCKETS,
+        precomputed_pos: Optional[Dict] = None,
+        html_cache_path: Optional[Path] = None
+) -> "go.Figure":
     """
     Generate an interactive 3D network visualization from a NetworkX graph.
 
@@ -43,93 +750,115 @@ def generate_3d_network_figure(
         k (float): Optimal distance between nodes in the layout algorithm.
         seed (int): Random seed for layout consistency.
         node_size (int): Size of the plotted nodes.
-        edge_opacity (float): Opacity for the plotted edges.
+        edge_opacity (float): Opacity for the plotted edges (of the strongest bucket, see below).
+        layout_engine (str): "igraph" for igraph's compiled Fruchterman-Reingold layout, "numpy", "numba" or
+            "cupy" for fast_spring_layout with that engine, "barnes_hut" for barnes_hut_layout, or "nx" to use
+            `layout_func`. Falls back to "numpy" if igraph is not installed.
+        cache_layout (bool): Reuse (and store) layouts in the on-disk layout cache.
+        warm_start (bool): Start a computed layout from the previous one (saved in the cache directory),
+            with fewer iterations, instead of from random positions. The positions then depend on the
+            previously plotted graphs rather than on this graph alone, and are not cached.
+        edge_weight_threshold (float): Only draw edges with |weight| >= this (0 draws all edges). The layout
+            still uses every edge; this only thins the plotted lines to shrink the figure.
+        edge_opacity_buckets (int): Split edges into this many (at most 3) traces by |weight|, with opacity
+            rising to `edge_opacity` for the strongest bucket. 1 draws all edges at `edge_opacity`.
+        precomputed_pos (dict, optional): Mapping node → position (e.g. from compute_layout). When given,
+            the layout step is skipped and the layout arguments above are ignored.
+        html_cache_path (Path, optional): Also write the figure as a standalone HTML file here (e.g. from
+            figure_cache_path), so later runs can open it without rebuilding. Plotly.js is loaded from its CDN.
 
     Returns:
         go.Figure: A Plotly Figure object representing the 3D network visualization.
+
+    Raises:
+        ValueError: If the layout engine is not supported (and no `precomputed_pos` is given).
     """
 
-    # Compute node positions
-    try:
-        pos = layout_func(G, dim=dim, seed=seed, k=k)
-    except (AttributeError, TypeError) as e:
-        logger.warning("Invalid layout function or parameters. Falling back to spring_layout. Error: %s", e)
-        pos = nx.spring_layout(G, dim=dim, seed=seed, k=k)
+    import plotly.graph_objects as go
 
-    # Prepare lists for node positions and colors
-    node_x, node_y, node_z = [], [], []
-    node_text = []
-    node_colors = []
+    # Index nodes once: all positions and edges below are addressed by integer row, never by node id
+    nodes = list(G.nodes())
+    node_index = {node: i for i, node in enumerate(nodes)}
+    edges, weights = _edge_arrays(G, node_index)
+    node_text = [str(node) for node in nodes]
 
-    # Construct color mapping if communities are provided
-    color_mapping = None
-    if communities:
-        from plotly.colors import qualitative
-        palette = qualitative.Plotly
-        unique_communities = sorted(set(communities.values()))
-        color_mapping = {
-            community: palette[i % len(palette)] for i, community in enumerate(unique_communities)
-        }
-
-    # Populate node positions and colors
-    for node in G.nodes():
-        x, y, z = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        node_z.append(z)
-        node_text.append(str(node))
-
-        if communities and color_mapping:
-            node_colors.append(color_mapping.get(communities.get(node), "blue"))
-        else:
-            node_colors.append("blue")  # Fallback node color
+    # Compute node positions as one contiguous float32 (n, dim) array, reusing a cached layout of the same
+    # graph when available. Plotly sends NumPy arrays to the browser as typed arrays, so float32 also halves
+    # the figure payload.
+    if precomputed_pos is not None:
+        P = _positions_array(precomputed_pos, nodes, dim)
+    else:
+        P = _layout_array(
+            G, nodes, edges, weights, layout_func, layout_engine, dim, k, seed, cache_layout, warm_start
+        )
+
+    # Gather node colours and edge coordinates for every trace in one pass over the index arrays
+    node_colors, edge_xyz, bucket_bounds = _build_trace_arrays(
+        P, nodes, edges, weights, communities, edge_weight_threshold, edge_opacity_buckets
+    )
 
+    # Above LABEL_LIMIT nodes, per-node text sprites dominate browser rendering, so labels are only shown
+    # on hover
+    show_labels = len(nodes) <= GRAPH_CONFIG.LABEL_LIMIT
     node_trace = go.Scatter3d(
-        x=node_x,
-        y=node_y,
-        z=node_z,
-        mode="markers+text",
+        x=P[:, 0],
+        y=P[:, 1],
+        z=P[:, 2],
+        mode="markers+text" if show_labels else "markers",
         marker=dict(
             size=node_size,
-            color=node_colors,
+            sizemode="diameter",
+            color=node_colors.tolist(),
             showscale=False  # Hide colorbar because colors are from communities
         ),
-        text=node_text,
+        text=node_text if show_labels else None,
+        hovertext=None if show_labels else node_text,
         hoverinfo="text"
     )
 
-    # Build edge traces
-    edge_x, edge_y, edge_z = [], [], []
-    for src, dst in G.edges():
-        x0, y0, z0 = pos[src]
-        x1, y1, z1 = pos[dst]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
-        edge_z.extend([z0, z1, None])
-
-    edge_trace = go.Scatter3d(
-        x=edge_x,
-        y=edge_y,
-        z=edge_z,
-        mode="lines",
-        line=dict(color="grey", width=1),
-        opacity=edge_opacity,
-        hoverinfo="none"
-    )
+    # Opacity is baked into an rgba line colour rather than set per trace, and edges stay in at most three
+    # traces (one draw call each)
+    edge_traces = []
+    n_buckets = len(bucket_bounds) - 1
+    for b in range(n_buckets):
+        start, stop = 3 * bucket_bounds[b], 3 * bucket_bounds[b + 1]
+        if start == stop and n_buckets > 1:
+            continue
+        alpha = edge_opacity * (b + 1) / n_buckets
+        edge_traces.append(go.Scatter3d(
+            x=edge_xyz[0, start:stop],
+            y=edge_xyz[1, start:stop],
+            z=edge_xyz[2, start:stop],
+            mode="lines",
+            line=dict(color=f"rgba(128, 128, 128, {alpha:.3g})", width=1),
+            hoverinfo="none"
+        ))
 
     # Assemble the figure
     fig = go.Figure(
-        data=[edge_trace, node_trace],
+        data=[*edge_traces, node_trace],
         layout=go.Layout(
             title=dict(text="3D Network Visualization", font=dict(size=16)),
             showlegend=False,
             scene=dict(
                 xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
                 yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                zaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+                zaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                aspectmode="data"
             )
         )
     )
 
-    logger.info("3D network figure generated with %d nodes and %d edges.", G.number_of_nodes(), G.number_of_edges())
+    logger.info("3D network figure generated with %d nodes and %d edges.", G.number_of_nodes(), bucket_bounds[-1])
+
+    if html_cache_path is not None:
+        try:
+            fig.write_html(html_cache_path, include_plotlyjs="cdn", full_html=True)
+            logger.info("Cached figure to %s.", html_cache_path)
+            # Only evict from the cache directory itself, never from an output directory chosen by the caller
+            html_dir = Path(html_cache_path).resolve().parent
+            if html_dir.is_relative_to(Path(DIRECTORY_CONFIG.CACHE_DIR).resolve()):
+                prune_cache(html_dir)
+        except Exception as e:
+            logger.warning("Failed to cache figure to %s: %s", html_cache_path, e)
     return fig
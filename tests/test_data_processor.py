@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Test: test_data_processor.py
+
+These test cases pin the behaviour of the data processing functions (returns, correlation, caching and
+matrix storage) against plain pandas / NumPy references.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_processor import (
+    RESULT_CACHE_PREFIX,
+    aggregate_daily_returns,
+    aggregate_daily_returns_from_frames,
+    compute_correlation_matrix,
+    compute_returns_and_correlation,
+    fingerprint_raw_data,
+    load_matrix_from_npy,
+    quantize_correlation_matrix,
+    save_matrix_to_npy,
+)
+
+
+@pytest.fixture
+def returns_df() -> pd.DataFrame:
+    """ Random float32 daily returns for five tickers, as produced by the aggregation step. """
+    rng = np.random.default_rng(0)
+    values = rng.normal(scale=0.02, size=(250, 5)).astype(np.float32)
+    return pd.DataFrame(values, columns=["AAA", "BBB", "CCC", "DDD", "EEE"])
+
+
+def test_compute_correlation_matrix_leaves_input_unchanged(returns_df):
+    original = returns_df.copy()
+    compute_correlation_matrix(returns_df)
+    pd.testing.assert_frame_equal(returns_df, original)
+
+
+def test_compute_correlation_matrix_matches_pandas(returns_df):
+    corr = compute_correlation_matrix(returns_df)
+    expected = returns_df.astype(np.float64).corr()
+    np.testing.assert_allclose(corr.to_numpy(), expected.to_numpy(), atol=1e-5)
+    assert list(corr.index) == list(returns_df.columns)
+    assert list(corr.columns) == list(returns_df.columns)
+
+
+
+def test_aggregated_returns_match_aligned_pct_change():
+    # Tickers with different listing spans and missing trading days, so the calendars only partly overlap
+    rng = np.random.default_rng(2)
+    dates = pd.date_range("2023-01-02", periods=120, freq="B", name="Date")
+    frames = {}
+    for j, ticker in enumerate(["AAA", "BBB", "CCC", "DDD"]):
+        index = dates[3 * j:len(dates) - 2 * j]
+        index = index[rng.random(len(index)) > 0.1]
+        close = 100 * np.cumprod(1 + rng.normal(scale=0.01, size=len(index)))
+        frames[ticker] = pd.DataFrame({"Close": close.astype(np.float32)}, index=index)
+
+    returns = aggregate_daily_returns_from_frames(frames)
+    # The per-ticker Series aligned by the DataFrame constructor, as aggregated before the preallocated matrix
+    expected = pd.DataFrame({ticker: df["Close"].pct_change().dropna() for ticker, df in frames.items()}).dropna()
+    assert len(returns) > 0
+    pd.testing.assert_frame_equal(returns, expected, check_freq=False)
+
+
+def test_save_matrix_to_npy_round_trip(returns_df, tmp_path):
+    corr = compute_correlation_matrix(returns_df)
+    save_matrix_to_npy(corr, "corr.npy", output_dir=tmp_path)
+    loaded = load_matrix_from_npy("corr.npy", input_dir=tmp_path)
+    assert loaded.dtypes.eq(np.float32).all()
+    pd.testing.assert_frame_equal(loaded, corr.astype(np.float32))
+
+
+def test_save_matrix_to_npy_int8_round_trip(returns_df, tmp_path):
+    corr = compute_correlation_matrix(returns_df)
+    save_matrix_to_npy(corr, "corr.npy", output_dir=tmp_path, dtype="int8")
+    loaded = load_matrix_from_npy("corr.npy", input_dir=tmp_path)
+    assert loaded.dtypes.eq(np.int8).all()
+    np.testing.assert_array_equal(loaded.to_numpy(), quantize_correlation_matrix(corr.to_numpy()))
+    assert list(loaded.index) == list(corr.index)
+    assert list(loaded.columns) == list(corr.columns)
+
+
+def _write_raw_closes(input_dir, n_days: int = 60) -> list:
+    """ Write Parquet raw data files with random float32 closes for three tickers and return the tickers. """
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2023-01-02", periods=n_days, freq="B", name="Date")
+    tickers = ["AAA", "BBB", "CCC"]
+    for ticker in tickers:
+        close = 100 * np.cumprod(1 + rng.normal(scale=0.01, size=n_days))
+        pd.DataFrame({"Close": close.astype(np.float32)}, index=dates).to_parquet(input_dir / f"{ticker}.parquet")
+    return tickers
+
+
+def test_cached_returns_match_fresh_returns(tmp_path):
+    input_dir, cache_dir = tmp_path / "raw", tmp_path / "cache"
+    input_dir.mkdir()
+    cache_dir.mkdir()
+    tickers = _write_raw_closes(input_dir)
+
+    computed_returns, computed_corr = compute_returns_and_correlation(tickers, input_dir, cache_dir=cache_dir)
+    cached_returns, cached_corr = compute_returns_and_correlation(tickers, input_dir, cache_dir=cache_dir)
+    fresh_returns = aggregate_daily_returns(tickers, input_dir)
+
+    assert any(cache_dir.glob(f"{RESULT_CACHE_PREFIX}returns_*.parquet"))
+    pd.testing.assert_frame_equal(computed_returns, fresh_returns, check_freq=False)
+    pd.testing.assert_frame_equal(cached_returns, fresh_returns, check_freq=False)
+    pd.testing.assert_frame_equal(cached_corr, computed_corr)
+
+    # The aggregated returns are the plain percentage changes of the closes
+    for ticker in tickers:
+        close = pd.read_parquet(input_dir / f"{ticker}.parquet")["Close"]
+        expected = close.pct_change().iloc[1:].to_numpy()
+        np.testing.assert_allclose(fresh_returns[ticker].to_numpy(), expected, rtol=1e-5, atol=1e-7)
+
+
+def test_cache_ignores_entries_from_older_versions(tmp_path):
+    input_dir, cache_dir = tmp_path / "raw", tmp_path / "cache"
+    input_dir.mkdir()
+    cache_dir.mkdir()
+    tickers = _write_raw_closes(input_dir)
+
+    # An entry for the same raw data written by an older cache version
+    stale_key = f"v1_{fingerprint_raw_data(tickers, input_dir)}"
+    stale = pd.DataFrame({ticker: [9.0] for ticker in tickers})
+    stale.to_parquet(cache_dir / f"{RESULT_CACHE_PREFIX}returns_{stale_key}.parquet")
+    stale.to_parquet(cache_dir / f"{RESULT_CACHE_PREFIX}corr_{stale_key}.parquet")
+
+    returns, _ = compute_returns_and_correlation(tickers, input_dir, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(returns, aggregate_daily_returns(tickers, input_dir), check_freq=False)
+    assert not (cache_dir / f"{RESULT_CACHE_PREFIX}returns_{stale_key}.parquet").exists()
+
+
+def test_cache_keeps_other_files_in_its_directory(tmp_path):
+    input_dir, cache_dir = tmp_path / "raw", tmp_path / "processed"
+    input_dir.mkdir()
+    cache_dir.mkdir()
+    tickers = _write_raw_closes(input_dir)
+
+    # Processed outputs that merely look like cache entries
+    user_files = [cache_dir / "returns_2024.parquet", cache_dir / "corr_sector.parquet"]
+    for path in user_files:
+        pd.DataFrame({"x": [1.0]}).to_parquet(path)
+
+    compute_returns_and_correlation(tickers, input_dir, cache_dir=cache_dir)
+    assert all(path.exists() for path in user_files)
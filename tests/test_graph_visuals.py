@@ -5,21 +5,224 @@ Test: test_graph_visuals.py
 These test cases load a network in to a plotly graph for browser rendering.
 """
 
+import dataclasses
+import os
+import webbrowser
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+import pytest
+
 # Import modules and config
-from src.visualization.graph_plotter import generate_3d_network_figure
-from src.network.network_builder import load_network
+from src.visualization import graph_plotter
+from src.visualization.graph_plotter import (
+    barnes_hut_layout,
+    compute_layout,
+    fast_spring_layout,
+    figure_cache_path,
+    generate_3d_network_figure,
+)
+from src.network.network_builder import build_network_from_array, load_network, load_network_fast
 from src.network.community_builder import load_communities
 from config import PROJECT_ROOT
 
 
-graph_file_path = PROJECT_ROOT / "data" / "processed" / "network.gexf"
+graph_file_path = PROJECT_ROOT / "data" / "processed" / "network.parquet"
+gexf_file_path = PROJECT_ROOT / "data" / "processed" / "network.gexf"
 communities_file_path = PROJECT_ROOT / "data" / "processed" / "communities.json"
 
-# Load the network graph and communities mapping from file.
-G = load_network(str(graph_file_path))
-communities = load_communities(str(communities_file_path))
 
-fig = generate_3d_network_figure(G, communities=communities)
-fig.show(renderer='browser')
+@pytest.mark.parametrize("layout_engine", ["igraph", "numpy", "nx"])
+def test_figure_for_unweighted_graph(layout_engine):
+    G = nx.karate_club_graph()
+    for _, _, data in G.edges(data=True):
+        data.pop("weight", None)
+    fig = generate_3d_network_figure(G, layout_engine=layout_engine, cache_layout=False, warm_start=False)
+    assert len(fig.data[-1].x) == G.number_of_nodes()
+    assert len(fig.data[0].x) == 3 * G.number_of_edges()
+
+
+
+def test_unknown_layout_engine_is_rejected():
+    with pytest.raises(ValueError, match="numbaa"):
+        compute_layout(nx.karate_club_graph(), layout_engine="numbaa", cache_layout=False)
+
+
+
+def _weighted_graph_and_start(seed: int = 3, dim: int = 3):
+    """ The karate club graph with positive random edge weights, and float32 start positions. """
+    rng = np.random.default_rng(seed)
+    G = nx.karate_club_graph()
+    for u, v in G.edges():
+        G.edges[u, v]["weight"] = float(rng.uniform(0.5, 1.0))
+    return G, {node: rng.random(dim).astype(np.float32) for node in G}
+
+
+def _nx_spring_layout(G, start, iterations):
+    """ nx.spring_layout from the same start positions, the reference the layout engines follow. """
+    dim = len(next(iter(start.values())))
+    start = {node: p.astype(np.float64) for node, p in start.items()}
+    return nx.spring_layout(G, dim=dim, k=0.3, pos=start, iterations=iterations, threshold=1e-4)
+
+
+def _max_difference(pos, reference):
+    return max(float(np.abs(pos[node] - reference[node]).max()) for node in reference)
+
+
+@pytest.mark.parametrize("iterations", [1, 5, 50])
+@pytest.mark.parametrize("block_size", [512, 7])
+def test_fast_spring_layout_matches_networkx(iterations, block_size):
+    G, start = _weighted_graph_and_start()
+    pos = fast_spring_layout(G, dim=3, k=0.3, pos=start, iterations=iterations, tol=0, block_size=block_size)
+    assert _max_difference(pos, _nx_spring_layout(G, start, iterations)) < 1e-4
+
+
+
+# Float32 rounding differences grow over many iterations of the force simulation, so the kernel is compared
+# over the first few, where every step must agree
+@pytest.mark.parametrize("iterations", [1, 5, 10])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_numba_spring_layout_matches_networkx(iterations, dim):
+    pytest.importorskip("numba")
+    G, start = _weighted_graph_and_start(dim=dim)
+    pos = fast_spring_layout(G, dim=dim, k=0.3, pos=start, iterations=iterations, tol=0, engine="numba")
+    assert _max_difference(pos, _nx_spring_layout(G, start, iterations)) < 1e-4
+
+
+
+@pytest.mark.parametrize("iterations", [1, 5, 10])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_barnes_hut_layout_without_approximation_matches_networkx(iterations, dim):
+    pytest.importorskip("numba")
+    G, start = _weighted_graph_and_start(dim=dim)
+    # theta=0 opens every octree cell, so the repulsion is exact
+    pos = barnes_hut_layout(G, dim=dim, k=0.3, pos=start, iterations=iterations, tol=0, theta=0.0)
+    assert _max_difference(pos, _nx_spring_layout(G, start, iterations)) < 1e-4
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_barnes_hut_step_approximates_exact_repulsion(dim):
+    pytest.importorskip("numba")
+    # Large enough for a multi-level octree; one step, so differences only come from the approximation
+    G = nx.gnm_random_graph(300, 1200, seed=3)
+    exact = fast_spring_layout(G, dim=dim, k=None, seed=1, iterations=1, tol=0, engine="numba")
+    errors = [
+        _max_difference(barnes_hut_layout(G, dim=dim, k=None, seed=1, iterations=1, tol=0, theta=theta), exact)
+        for theta in (0.0, 0.5, 0.8)
+    ]
+    assert errors[0] < 1e-5
+    assert errors[1] <= errors[2] < 5e-3
+
+
+def test_prune_cache_evicts_least_recently_used(tmp_path):
+    for i in range(4):
+        path = tmp_path / f"layout_{i}.npz"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    (tmp_path / "last_pos.npz").write_bytes(b"x" * 100)
+
+    assert graph_plotter.prune_cache(tmp_path, max_bytes=250) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["last_pos.npz", "layout_2.npz", "layout_3.npz"]
+    assert graph_plotter.prune_cache(tmp_path, max_bytes=0) == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["last_pos.npz"]
+
+
+def test_figure_html_outside_the_cache_is_not_pruned(tmp_path, monkeypatch):
+    # Would be evicted by any pruning of tmp_path: the budget is below a single figure
+    monkeypatch.setattr(graph_plotter.prune_cache, "__defaults__", (tmp_path, 0))
+    (tmp_path / "layout_mine.npz").write_bytes(b"x" * 100)
+    html_path = tmp_path / "figure_report.html"
+    generate_3d_network_figure(nx.karate_club_graph(), cache_layout=False, html_cache_path=html_path)
+    assert (tmp_path / "layout_mine.npz").exists()
+    assert html_path.exists()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """ Point the layout cache and the warm-start file at a temporary directory. """
+    for func in (graph_plotter._cached_layout, graph_plotter._warm_start_positions, graph_plotter._save_warm_start):
+        monkeypatch.setattr(func, "__defaults__", (tmp_path,))
+    return tmp_path
+
+
+def test_default_layouts_are_reproducible(cache_dir):
+    G = nx.karate_club_graph()
+    first = compute_layout(G, layout_engine="numpy", cache_layout=False)
+    # A different previous layout must not change the default (cold) result
+    compute_layout(nx.les_miserables_graph(), layout_engine="numpy", cache_layout=False, warm_start=True)
+    compute_layout(G, layout_engine="numpy", cache_layout=False, warm_start=True)
+    second = compute_layout(G, layout_engine="numpy", cache_layout=False)
+    assert all(np.array_equal(first[n], second[n]) for n in G)
+
+
+def test_warm_started_layouts_bypass_the_cache(cache_dir):
+    G = nx.karate_club_graph()
+    cold = compute_layout(G, layout_engine="numpy", warm_start=False)
+    compute_layout(G, layout_engine="numpy", warm_start=False)
+    assert len(list(cache_dir.glob("layout_*.npz"))) == 1
+
+    # Warm-started positions depend on the previous layout, so they are neither served from nor stored in the cache
+    compute_layout(G, layout_engine="numpy", warm_start=True)
+    compute_layout(G, layout_engine="numpy", warm_start=True)
+    assert len(list(cache_dir.glob("layout_*.npz"))) == 1
+    again = compute_layout(G, layout_engine="numpy", warm_start=False)
+    assert all(np.array_equal(cold[n], again[n]) for n in G)
+
+
+def test_layout_cache_key_covers_layout_tol(cache_dir, monkeypatch):
+    G = nx.karate_club_graph()
+    compute_layout(G, layout_engine="numpy", warm_start=False)
+    config = dataclasses.replace(graph_plotter.GRAPH_CONFIG, LAYOUT_TOL=0.5)
+    monkeypatch.setattr(graph_plotter, "GRAPH_CONFIG", config)
+    compute_layout(G, layout_engine="numpy", warm_start=False)
+    assert len(list(cache_dir.glob("layout_*.npz"))) == 2
+
+
+
+def _plotted_edges(G):
+    node_index = {node: i for i, node in enumerate(G.nodes())}
+    nodes = list(G.nodes())
+    edges, weights = graph_plotter._edge_arrays(G, node_index)
+    return {(frozenset((nodes[u], nodes[v])), round(float(w), 6)) for (u, v), w in zip(edges, weights)}
+
+
+def test_edge_arrays_follow_graph_modifications():
+    M = np.array([[1.0, 0.9, 0.1], [0.9, 1.0, 0.6], [0.1, 0.6, 1.0]], dtype=np.float32)
+    G = build_network_from_array(M, ["A", "B", "C"], 0.5)
+    assert _plotted_edges(G) == {(frozenset("AB"), 0.9), (frozenset("BC"), 0.6)}
+
+    # Same node and edge counts as the build, but different edges and weights
+    G.remove_edge("A", "B")
+    G.add_edge("A", "C", weight=0.7)
+    G.add_edge("B", "C", weight=0.2)
+    assert _plotted_edges(G) == {(frozenset("AC"), 0.7), (frozenset("BC"), 0.2)}
+
+
+if __name__ == "__main__":
+    network_file_path = graph_file_path if graph_file_path.exists() else gexf_file_path
+
+    # A figure already rendered from these exact files (and graph config) is reopened as-is
+    html_path = figure_cache_path(network_file_path, communities_file_path)
+    if html_path.exists():
+        webbrowser.open(html_path.as_uri())
+        print("Cached graph opened...")
+        raise SystemExit
+
+    # Load the network graph from file.
+    # The layout is cached on disk, so reruns on the same network skip the layout computation.
+    if network_file_path == graph_file_path:
+        G = load_network_fast(str(graph_file_path))
+    else:
+        G = load_network(str(gexf_file_path))
+
+    # Run the layout in a worker process while the communities mapping loads
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        layout_future = executor.submit(compute_layout, G)
+        communities = load_communities(str(communities_file_path))
+        pos = layout_future.result()
+
+    fig = generate_3d_network_figure(G, communities=communities, precomputed_pos=pos, html_cache_path=html_path)
+    fig.show(renderer='browser')
 
-print("Graph rendered...")
+    print("Graph rendered...")
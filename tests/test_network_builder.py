@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Test: test_network_builder.py
+
+These test cases pin the behaviour of network construction (edge thresholding, sorted-edge and incremental
+builds) and community detection against straightforward NetworkX / NumPy references.
+"""
+
+import igraph as ig
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import DATA_CONFIG
+from src.data.data_processor import quantize_correlation_matrix
+from src.network.community_builder import detect_communities
+from src.network.network_builder import (
+    _threshold_edges,
+    build_correlation_network,
+    build_network_from_array,
+    build_network_from_sorted_edges,
+    load_network_fast,
+    save_network_fast,
+    sort_edges_by_magnitude,
+    update_network_threshold,
+)
+
+
+def _random_correlation(n: int, seed: int = 0) -> np.ndarray:
+    """ A symmetric float32 array with values in [-1, 1] and a unit diagonal. """
+    rng = np.random.default_rng(seed)
+    M = rng.uniform(-1.0, 1.0, size=(n, n)).astype(np.float32)
+    M = np.triu(M, k=1)
+    M = M + M.T
+    np.fill_diagonal(M, 1.0)
+    return M
+
+
+def _reference_edges(M: np.ndarray, threshold: float):
+    """ Upper-triangle pairs with |M[i, j]| >= threshold, via np.triu_indices. """
+    iu, ju = np.triu_indices(len(M), k=1)
+    keep = np.abs(M[iu, ju]) >= threshold
+    return iu[keep], ju[keep], M[iu, ju][keep]
+
+
+def _edge_set(G: nx.Graph):
+    return {(frozenset((u, v)), w) for u, v, w in G.edges(data="weight")}
+
+
+@pytest.mark.parametrize("engine", ["numpy", "numba"])
+@pytest.mark.parametrize("n", [40, 700])
+def test_threshold_edges_matches_triu_indices(engine, n):
+    M = _random_correlation(n)
+    ii, jj, ww = _threshold_edges(M, 0.6, engine=engine)
+    ref_i, ref_j, ref_w = _reference_edges(M, 0.6)
+    np.testing.assert_array_equal(ii, ref_i)
+    np.testing.assert_array_equal(jj, ref_j)
+    np.testing.assert_array_equal(ww, ref_w)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "numba"])
+@pytest.mark.parametrize("n", [40, 700])
+def test_threshold_edges_int8_matches_triu_indices(engine, n):
+    Q = quantize_correlation_matrix(_random_correlation(n))
+    scale = DATA_CONFIG.CORRELATION_INT8_SCALE
+    ii, jj, ww = _threshold_edges(Q, 0.6, engine=engine)
+    ref_i, ref_j, ref_w = _reference_edges(Q.astype(np.float32) / scale, 0.6)
+    np.testing.assert_array_equal(ii, ref_i)
+    np.testing.assert_array_equal(jj, ref_j)
+    np.testing.assert_allclose(ww, ref_w)
+
+
+
+@pytest.mark.parametrize("threshold", [0.5, 64 / 127, 0.8])
+def test_int8_network_matches_float_network(threshold):
+    tickers = [f"T{i}" for i in range(60)]
+    M = _random_correlation(len(tickers), seed=2)
+    Q = quantize_correlation_matrix(M)
+    scale = DATA_CONFIG.CORRELATION_INT8_SCALE
+
+    # Exactly the network of the dequantized values, thresholds landing on a quantization step included
+    G = build_network_from_array(Q, tickers, threshold)
+    expected = build_network_from_array(Q.astype(np.float32) / scale, tickers, threshold)
+    assert _edge_set(G) == _edge_set(expected)
+
+    # Against the unquantized matrix, edges only differ for correlations within half a step of the threshold
+    exact = {edge for edge, _ in _edge_set(build_network_from_array(M, tickers, threshold))}
+    near = {
+        frozenset((tickers[i], tickers[j]))
+        for i, j in zip(*np.triu_indices(len(M), k=1))
+        if abs(abs(M[i, j]) - threshold) <= 0.5 / scale
+    }
+    assert {edge for edge, _ in _edge_set(G)} ^ exact <= near
+
+
+def test_threshold_edges_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        _threshold_edges(_random_correlation(4), 0.5, engine="fortran")
+
+
+def test_sorted_edges_match_fresh_build():
+    tickers = [f"T{i}" for i in range(30)]
+    M = _random_correlation(len(tickers))
+    corr_df = pd.DataFrame(M, index=tickers, columns=tickers)
+    G = build_network_from_sorted_edges(sort_edges_by_magnitude(M, tickers), threshold=0.5)
+    assert list(G.nodes()) == tickers
+    assert _edge_set(G) == _edge_set(build_correlation_network(corr_df, threshold=0.5))
+
+
+@pytest.mark.parametrize("thresholds", [
+    (0.5, 0.7, 0.3, 0.3, 0.95, 0.0, 0.5),
+    (0.0, 0.9),
+])
+def test_update_network_threshold_matches_fresh_build(thresholds):
+    tickers = [f"T{i}" for i in range(30)]
+    edges = sort_edges_by_magnitude(_random_correlation(len(tickers), seed=1), tickers)
+    G = build_network_from_sorted_edges(edges, threshold=thresholds[0])
+    for old, new in zip(thresholds, thresholds[1:]):
+        changed = update_network_threshold(G, edges, old, new)
+        fresh = build_network_from_sorted_edges(edges, threshold=new)
+        assert _edge_set(G) == _edge_set(fresh)
+        assert set(G.nodes()) == set(tickers)
+        if old == new:
+            assert changed == 0
+
+
+
+def test_update_network_threshold_matches_full_rebuild_along_a_slider_walk():
+    tickers = [f"T{i}" for i in range(40)]
+    # Values on a coarse grid give many ties in |corr| at the slider steps, plus a few missing correlations
+    M = np.round(_random_correlation(len(tickers), seed=3), 1)
+    M[2, 7] = M[7, 2] = np.nan
+    corr_df = pd.DataFrame(M, index=tickers, columns=tickers)
+    edges = sort_edges_by_magnitude(M, tickers)
+
+    rng = np.random.default_rng(4)
+    steps = np.concatenate(([5], rng.integers(0, 21, size=30), [20, 0]))
+    G = build_network_from_sorted_edges(edges, threshold=steps[0] * 0.05)
+    for old, new in zip(steps * 0.05, steps[1:] * 0.05):
+        update_network_threshold(G, edges, old, new)
+        # The per-slider-move rebuild from the correlation matrix that the incremental update replaced
+        assert _edge_set(G) == _edge_set(build_correlation_network(corr_df, threshold=new))
+
+
+def test_save_network_fast_round_trip(tmp_path):
+    G = nx.Graph()
+    G.add_nodes_from(["AAA", "BBB", "CCC", "DDD"])
+    G.add_weighted_edges_from([("AAA", "BBB", 0.75), ("BBB", "CCC", -0.5)])
+    save_network_fast(G, "network.parquet", output_dir=tmp_path)
+    loaded = load_network_fast("network.parquet", input_dir=tmp_path)
+    assert list(loaded.nodes()) == list(G.nodes())
+    assert _edge_set(loaded) == _edge_set(G)
+
+
+def _two_cliques() -> nx.Graph:
+    """ Two 5-cliques joined by one edge, without edge weights. """
+    G = nx.disjoint_union(nx.complete_graph(5), nx.complete_graph(5))
+    G.add_edge(0, 5)
+    return G
+
+
+@pytest.mark.parametrize("algorithm", ["leiden", "louvain", "greedy"])
+def test_detect_communities_unweighted_networkx(algorithm):
+    communities = detect_communities(_two_cliques(), algorithm=algorithm)
+    assert communities is not None
+    assert set(communities) == set(range(10))
+    assert len({communities[n] for n in range(5)}) == 1
+    assert len({communities[n] for n in range(5, 10)}) == 1
+    assert communities[0] != communities[5]
+
+
+def test_detect_communities_unweighted_igraph():
+    g = ig.Graph.from_networkx(_two_cliques())
+    g.vs["name"] = [str(n) for n in g.vs["_nx_name"]]
+    communities = detect_communities(g, algorithm="leiden")
+    assert communities is not None
+    assert len(set(communities.values())) == 2
+    assert communities["0"] != communities["5"]
+
+
+def test_detect_communities_partially_weighted():
+    G = _two_cliques()
+    G.edges[1, 2]["weight"] = -0.9
+    communities = detect_communities(G, algorithm="leiden")
+    assert communities is not None
+    assert communities[1] == communities[2]